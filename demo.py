@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 """
 Demo script for the FileEngine Python client
+
+Run with ``--async`` to exercise the asyncio client instead.
 """
 
-from fileengine import ManagedFiles
-from fileengine import fileservice_pb2
+import asyncio
+import logging
+import logging.handlers
+import sys
+
+from fileengine import ManagedFiles, AsyncManagedFiles, Permission
+
+log = logging.getLogger("demo")
 
 def main():
     # Create a ManagedFiles instance with connection to the gRPC service.
@@ -19,102 +27,129 @@ def main():
     )
 
     try:
-        # Create a root directory
-        root_dir = mf.mkdir("", "demo_root")
-        print(f"Created root directory with UID: {root_dir}")
-
-        # Create a subdirectory
-        sub_dir = mf.mkdir(root_dir, "subdir")
-        print(f"Created subdirectory with UID: {sub_dir}")
-
-        # Create a file in the subdirectory
-        file_uid = mf.touch(sub_dir, "demo_file.txt")
-        print(f"Created file with UID: {file_uid}")
+        # Create the root directory, a subdirectory and a file in it
+        root_dir, sub_dir, file_uid = mf.ensure_path("demo_root/subdir/demo_file.txt", create_file=True)
+        log.info("Created root directory with UID: %s", root_dir)
+        log.info("Created subdirectory with UID: %s", sub_dir)
+        log.info("Created file with UID: %s", file_uid)
 
         # Write content to the file
         content = b"This is a demo file for the FileEngine Python client."
         version = mf.put(file_uid, content)
-        print(f"Written content with version timestamp: {version}")
+        log.info("Written content with version timestamp: %s", version)
 
         # Read content from the file
         file_content = mf.get(file_uid)
-        print(f"Read content: {file_content.getvalue()}")
-
-        # List directory contents
-        contents = mf.dir(root_dir)
-        print(f"Directory contents: {contents}")
-
-        # Get file revisions
-        revisions = mf.revisions(file_uid)
-        print(f"File revisions: {revisions}")
-
-        # Get file metadata
-        file_name = mf.file_name(file_uid)
-        print(f"File name: {file_name}")
-
-        # Get modification time
-        mtime = mf.get_file_mtime(file_uid)
-        print(f"Modification time: {mtime}")
+        log.info("Read content: %s", file_content.getvalue())
+
+        # The directory listing, revisions, name and modification time are
+        # independent reads: issue them as one batch so their round trips overlap.
+        probes = mf.batch({
+            "contents": ("dir", (root_dir,)),
+            "revisions": ("revisions", (file_uid,)),
+            "file_name": ("file_name", (file_uid,)),
+            "mtime": ("get_file_mtime", (file_uid,)),
+        })
+        log.info("Directory contents: %s", probes['contents'])
+        log.info("File revisions: %s", probes['revisions'])
+        log.info("File name: %s", probes['file_name'])
+        log.info("Modification time: %s", probes['mtime'])
 
         # Demonstrate permission operations
-        print("\n--- Permission Operations ---")
+        log.info("\n--- Permission Operations ---")
 
         # Grant read permission to a user (example)
         permission_granted = mf.grant_permission(
             resource_uid=file_uid,
             principal="demo_user",
-            permission=fileservice_pb2.Permission.READ
+            permission=Permission.READ
         )
-        print(f"Granted read permission: {permission_granted}")
+        log.info("Granted read permission: %s", permission_granted)
 
         # Check if user has permission
         has_permission = mf.check_permission(
             resource_uid=file_uid,
-            required_permission=fileservice_pb2.Permission.READ
+            required_permission=Permission.READ
         )
-        print(f"User has read permission: {has_permission}")
+        log.info("User has read permission: %s", has_permission)
 
         # Revoke the permission
         permission_revoked = mf.revoke_permission(
             resource_uid=file_uid,
             principal="demo_user",
-            permission=fileservice_pb2.Permission.READ
+            permission=Permission.READ
         )
-        print(f"Revoked read permission: {permission_revoked}")
+        log.info("Revoked read permission: %s", permission_revoked)
 
         # Demonstrate status operations
-        print("\n--- Status Operations ---")
+        log.info("\n--- Status Operations ---")
 
         # Get storage usage
         storage_info = mf.get_storage_usage()
         if storage_info:
-            print(f"Storage usage: {storage_info}")
+            log.info("Storage usage: %s", storage_info)
         else:
-            print("Could not retrieve storage usage")
+            log.info("Could not retrieve storage usage")
 
         # Trigger sync
         sync_triggered = mf.trigger_sync()
-        print(f"Sync triggered: {sync_triggered}")
+        log.info("Sync triggered: %s", sync_triggered)
 
         # Restore to version (if multiple versions exist)
         revisions = mf.revisions(file_uid)
         if len(revisions) > 1:
             # Restore to the second-to-last version as an example
             restore_version = mf.restore_to_version(file_uid, revisions[1].version)
-            print(f"Restored to version: {restore_version}")
+            log.info("Restored to version: %s", restore_version)
 
         # Purge old versions (keep only the latest 2)
         purged = mf.purge_old_versions(file_uid, keep_count=2)
-        print(f"Purged old versions: {purged}")
+        log.info("Purged old versions: %s", purged)
 
-        print("\nDemo completed successfully!")
+        log.info("\nDemo completed successfully!")
 
     except Exception as e:
-        print(f"Error during demo: {e}")
+        log.error("Error during demo: %s", e)
 
     finally:
         # Close the connection
         mf.close()
 
+async def main_async():
+    # The asyncio client overlaps independent calls with asyncio.gather.
+    async with AsyncManagedFiles(
+        user_name="demo_admin",
+        user_roles=["system_admin"],
+        user_claims=["read", "write", "delete", "admin"],
+        server_address="localhost:50051",
+        tenant="default"
+    ) as mf:
+        try:
+            root_dir, sub_dir, file_uid = await mf.ensure_path(
+                "demo_root_async/subdir/demo_file.txt", create_file=True)
+            await mf.put(file_uid, b"This is a demo file for the async FileEngine client.")
+            log.info("Created and wrote file with UID: %s", file_uid)
+
+            # These reads are independent: four round trips overlap into one.
+            contents, revisions, file_name, mtime = await asyncio.gather(
+                mf.dir(root_dir), mf.revisions(file_uid),
+                mf.file_name(file_uid), mf.get_file_mtime(file_uid))
+            log.info("Directory contents: %s", contents)
+            log.info("File revisions: %s", revisions)
+            log.info("File name: %s", file_name)
+            log.info("Modification time: %s", mtime)
+
+            log.info("\nAsync demo completed successfully!")
+        except Exception as e:
+            log.error("Error during async demo: %s", e)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Buffer the demo's output and write it once at exit (or on an error), so
+    # console I/O does not sit between the RPCs being demonstrated.
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[
+        logging.handlers.MemoryHandler(capacity=1000, flushLevel=logging.ERROR,
+                                       target=logging.StreamHandler())])
+    if "--async" in sys.argv[1:]:
+        asyncio.run(main_async())
+    else:
+        main()
\ No newline at end of file
@@ -11,10 +11,23 @@ while the server is temporarily read-only during a primary-database failover —
 a transient condition the caller may retry.
 """
 
+import os
+
+# Deployments that must not silently run on the pure-Python codec (e.g. a
+# platform without a protobuf wheel) can make that an import error.
+if os.environ.get("FILEENGINE_REQUIRE_NATIVE_PROTOBUF"):
+    from google.protobuf.internal import api_implementation
+    if api_implementation.Type() == "python":
+        raise ImportError("fileengine: protobuf is using the pure-Python implementation "
+                          "but FILEENGINE_REQUIRE_NATIVE_PROTOBUF is set")
+
 from .client import (
     ManagedFiles, FileType, FileInfo, DirectoryEntry, Revision, StorageUsage,
     ROOT_UID, ZERO_UID,
 )
+from .aio_client import AsyncManagedFiles
+from .fileservice_pb2 import Permission
+from .channel import get_shared_channel, close_shared_channels, ChannelPool
 from .exceptions import (
     FileEngineError, FileSystemError,
     ServerUnreachableError, ServiceUnavailableError, WriteUnavailableError,
@@ -24,8 +37,9 @@ from .exceptions import (
 
 __version__ = "1.1.0"
 __all__ = [
-    "ManagedFiles", "FileType", "FileInfo", "DirectoryEntry", "Revision",
-    "StorageUsage", "ROOT_UID", "ZERO_UID",
+    "ManagedFiles", "AsyncManagedFiles", "FileType", "FileInfo", "DirectoryEntry", "Revision",
+    "StorageUsage", "ROOT_UID", "ZERO_UID", "get_shared_channel",
+    "close_shared_channels", "ChannelPool", "Permission",
     # exceptions
     "FileEngineError", "FileSystemError",
     "ServerUnreachableError", "ServiceUnavailableError", "WriteUnavailableError",
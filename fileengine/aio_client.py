@@ -0,0 +1,649 @@
+"""
+FileEngine asyncio client
+
+:class:`AsyncManagedFiles` mirrors :class:`~fileengine.ManagedFiles` on top of
+``grpc.aio``: every RPC-backed method is a coroutine, so independent calls can
+be overlapped with :func:`asyncio.gather` instead of paying one round trip
+each::
+
+    async with AsyncManagedFiles(user_name="alice") as mf:
+        listing, revs = await asyncio.gather(mf.dir(folder), mf.revisions(doc))
+
+Arguments, return values and exceptions match the synchronous client for the
+methods both provide; file-object payloads to :meth:`~AsyncManagedFiles.put`
+are read on the default executor rather than in the event loop.
+"""
+
+import asyncio
+import inspect
+import io
+import time
+from typing import Dict, List, Mapping, Optional
+
+import grpc
+
+from . import fileservice_pb2
+from . import fileservice_pb2_grpc
+from .channel import CHANNEL_OPTIONS
+from .client import (
+    _ClientIdentity, Revision, StorageUsage, FileInfo, ROOT_UID,
+    _check, _raise_rpc, _coerce_permission, _coerce_effect,
+    _entry_converter, _column_getters, _to_file_info, _upload_source, _compression_for,
+    _metadata_compression, _remaining_size, _read_full, _FileChunks,
+    _MIN_COMPRESS_BYTES, _UPLOAD_CHUNK_BYTES,
+)
+from .exceptions import (
+    AlreadyExistsError, InvalidRequestError, NotFoundError, OperationError, ServerUnreachableError,
+)
+
+__all__ = ["AsyncManagedFiles"]
+
+
+async def _gather(aws):
+    """Run awaitables concurrently and return their results in order.
+
+    On the first failure the remaining calls are cancelled and awaited before
+    it is raised, so none is left running (or leaves an unretrieved exception)
+    after the caller has moved on.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _upload_source_async(uid, auth, payload):
+    """:func:`_upload_source` for the event loop: file objects are read on the
+    default executor, so a large upload does not block the loop."""
+    if not hasattr(payload, "read"):
+        return _upload_source(uid, auth, payload)
+    loop = asyncio.get_running_loop()
+    size = await loop.run_in_executor(None, _remaining_size, payload)
+    if size is not None and size > _UPLOAD_CHUNK_BYTES:
+        return size, _AsyncFileChunks(uid, auth, payload, size), None
+    return _upload_source(uid, auth, await loop.run_in_executor(None, payload.read))
+
+
+class _AsyncFileChunks(_FileChunks):
+    """Async-iterator flavour of ``_FileChunks``, reading on the default executor."""
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        index = self._next_index()
+        if index is None:
+            raise StopAsyncIteration
+        data = await asyncio.get_running_loop().run_in_executor(
+            None, _read_full, self.f, self._want(index))
+        return self._request(index, data)
+
+
+class AsyncManagedFiles(_ClientIdentity):
+    """
+    asyncio counterpart of :class:`~fileengine.ManagedFiles`.
+
+    An ``grpc.aio`` channel is bound to the event loop it was created on, so
+    construct (and close) the client from within the loop that uses it.
+    """
+
+    def __init__(self, user_roles: list = None, user_name: str = '',
+                 server_address: str = "localhost:50051", tenant: str = "",
+                 user_claims: list = None, source_addr: str = "",
+                 channel: grpc.aio.Channel = None, compression: str = "none"):
+        """
+        Initialize AsyncManagedFiles with a ``grpc.aio`` channel.
+
+        Args:
+            user_roles: User roles for permissions (default: [])
+            user_name: Username for operations
+            server_address: gRPC server address: ``host:port``, or
+                ``unix:/path/to.sock`` for a server on the same host
+            tenant: Tenant for operations (default: "" -> 'default' tenant)
+            user_claims: Additional user claims (list of str / (k, v) / dict)
+            source_addr: Client IP forwarded to the core for audit
+            channel: An existing ``grpc.aio`` channel. The caller keeps
+                ownership; :meth:`close` leaves it open.
+            compression: ``put``/metadata wire compression, as for ``ManagedFiles``.
+        """
+        self._init_identity(user_name, user_roles, user_claims, tenant, source_addr)
+        self._owns_channel = channel is None
+        self.channel = channel or grpc.aio.insecure_channel(
+            server_address, options=list(CHANNEL_OPTIONS))
+        self.stub = fileservice_pb2_grpc.FileServiceStub(self.channel)
+        self._compression = _compression_for(compression)
+
+    async def close(self):
+        """Close the gRPC connection if this client owns it."""
+        if self._owns_channel:
+            await self.channel.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def start_connecting(self):
+        """Begin the connection handshake in the background and return at once."""
+        self.channel.get_state(try_to_connect=True)
+
+    async def wait_ready(self, timeout: float = 5.0):
+        """Wait until the connection is established; raises
+        :class:`ServerUnreachableError` after ``timeout`` seconds."""
+        try:
+            await asyncio.wait_for(self.channel.channel_ready(), timeout)
+        except asyncio.TimeoutError:
+            raise ServerUnreachableError(f"server not ready after {timeout}s",
+                                         operation="wait_ready") from None
+
+    async def _call(self, rpc, request, operation, uid=None, default_cls=OperationError, compression=None):
+        """Invoke a unary RPC and return its checked response."""
+        try:
+            resp = await getattr(self.stub, rpc)(request, compression=compression)
+        except grpc.RpcError as e:
+            _raise_rpc(e, operation, uid)
+        return _check(resp, operation, uid, default_cls=default_cls)
+
+    # ------------------------------------------------------------------ #
+    # Directory operations
+    # ------------------------------------------------------------------ #
+    async def mkdir(self, parent_uuid: str, name: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """Create a directory and return the new UID."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("MakeDirectory", fileservice_pb2.MakeDirectoryRequest(
+            parent_uid=parent_uuid, name=name, auth=auth), "mkdir", parent_uuid)
+        return resp.uid
+
+    async def dir(self, uid, show_deleted: bool = False, user: str = None, tenant: str = None, roles: list = None, claims: list = None,
+                  fields=None):
+        """List directory contents as a list of DirectoryEntry (``fields`` as
+        for :meth:`ManagedFiles.dir`)."""
+        convert = _entry_converter(fields)
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        return [convert(e) for e in await self._list_entries(uid, show_deleted, auth)]
+
+    async def dir_columns(self, uid, columns=("uid", "name", "type", "size"), show_deleted: bool = False,
+                          user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> dict:
+        """List directory contents column-wise (see :meth:`ManagedFiles.dir_columns`)."""
+        getters = _column_getters(columns)
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        entries = await self._list_entries(uid, show_deleted, auth)
+        return {c: list(map(get, entries)) for c, get in getters.items()}
+
+    async def _list_entries(self, uid, show_deleted, auth):
+        if show_deleted:
+            resp = await self._call("ListDirectoryWithDeleted", fileservice_pb2.ListDirectoryWithDeletedRequest(
+                uid=uid, auth=auth), "dir", uid, default_cls=NotFoundError)
+        else:
+            resp = await self._call("ListDirectory", fileservice_pb2.ListDirectoryRequest(
+                uid=uid, auth=auth), "dir", uid, default_cls=NotFoundError)
+        return resp.entries
+
+    async def list_deleted(self, uid, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """Convenience for ``dir(uid, show_deleted=True)``."""
+        return await self.dir(uid, show_deleted=True, user=user, tenant=tenant, roles=roles, claims=claims)
+
+    async def ensure_path(self, path: str, create_file: bool = False, parent_uid: str = ROOT_UID,
+                          user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> List[str]:
+        """Resolve ``path``, creating missing components; returns their UIDs
+        (see :meth:`ManagedFiles.ensure_path`)."""
+        names = [n for n in path.split("/") if n]
+        if not names:
+            raise InvalidRequestError("empty path", operation="ensure_path")
+        ident = dict(user=user, tenant=tenant, roles=roles, claims=claims)
+        uids, parent = [], parent_uid
+        for i, name in enumerate(names):
+            want_dir = not (create_file and i == len(names) - 1)
+            try:
+                parent = await (self.mkdir if want_dir else self.touch)(parent, name, **ident)
+            except AlreadyExistsError:
+                found = next((e for e in await self.dir(parent, fields=("type",), **ident)
+                              if e.name == name), None)
+                if found is None or found.is_container != want_dir:
+                    raise InvalidRequestError(
+                        f"'{name}' exists but is not a {'directory' if want_dir else 'file'}",
+                        operation="ensure_path", uid=parent)
+                parent = found.uid
+            uids.append(parent)
+        return uids
+
+    # ------------------------------------------------------------------ #
+    # File operations
+    # ------------------------------------------------------------------ #
+    async def touch(self, container_uuid: str, name: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """Create an empty file and return the new UID."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("Touch", fileservice_pb2.TouchRequest(
+            parent_uid=container_uuid, name=name, auth=auth), "touch", container_uuid)
+        return resp.uid
+
+    async def put(self, uid: str, payload=None, return_open: bool = False, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """Write a new version of a file's content (bytes, str or a binary file
+        object); returns a float timestamp. File objects are read off the
+        event loop."""
+        if return_open:
+            raise NotImplementedError("return_open is not supported in the gRPC client")
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        size, chunks, data = await _upload_source_async(uid, auth, payload)
+        compression = self._compression if size >= _MIN_COMPRESS_BYTES else None
+        if chunks is not None:
+            try:
+                resp = await self.stub.StreamFileUpload(chunks, compression=compression)
+            except (grpc.RpcError, asyncio.CancelledError) as e:
+                # grpc.aio cancels the call when the request iterator raises.
+                if getattr(chunks, "error", None) is not None:
+                    raise chunks.error from None
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                _raise_rpc(e, "put", uid)
+            _check(resp, "put", uid)
+        else:
+            await self._call("PutFile", fileservice_pb2.PutFileRequest(
+                uid=uid, auth=auth, data=data), "put", uid, compression=compression)
+        return time.time()
+
+    async def get(self, uid: str, back: int = 0, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """Read file content as a BytesIO (``back`` = versions back, 0 = latest)."""
+        return io.BytesIO(await self.get_bytes(uid, back, user=user, tenant=tenant, roles=roles, claims=claims))
+
+    async def get_bytes(self, uid: str, back: int = 0, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bytes:
+        """Read file content as ``bytes`` (see :meth:`get`)."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        if back == 0:
+            chunks = []
+            try:
+                async for resp in self.stub.StreamFileDownload(
+                        fileservice_pb2.GetFileRequest(uid=uid, auth=auth)):
+                    _check(resp, "get", uid, default_cls=NotFoundError)
+                    if resp.data:
+                        chunks.append(resp.data)
+            except grpc.RpcError as e:
+                _raise_rpc(e, "get", uid)
+            return b"".join(chunks)
+
+        versions = await self.revision_versions(uid, user=user, tenant=tenant, roles=roles, claims=claims)
+        if len(versions) <= back:
+            raise NotFoundError(f"version {back} back does not exist", operation="get", uid=uid)
+        resp = await self._call("GetVersion", fileservice_pb2.GetVersionRequest(
+            uid=uid, version_timestamp=versions[back], auth=auth),
+            "get", uid, default_cls=NotFoundError)
+        return resp.data
+
+    async def entity_exists(self, entity_uid: str, include_deleted: bool = False) -> bool:
+        """Return True if the entity exists, False if it does not."""
+        resp = await self._call("Exists", fileservice_pb2.ExistsRequest(
+            uid=entity_uid, auth=self._create_auth_context()), "entity_exists", entity_uid)
+        return bool(resp.exists)
+
+    async def stat(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> FileInfo:
+        """Return a FileInfo for the entity; raises NotFoundError if absent."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("Stat", fileservice_pb2.StatRequest(uid=uid, auth=auth),
+                                "stat", uid, default_cls=NotFoundError)
+        return _to_file_info(resp.info)
+
+    async def list_renditions(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """List a file's hidden renditions (alternate-format children)."""
+        return await self.dir(uid, user=user, tenant=tenant, roles=roles, claims=claims)
+
+    async def is_dir(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Return True if the entity is a directory (False if it does not exist)."""
+        try:
+            info = await self.stat(uid, user=user, tenant=tenant, roles=roles, claims=claims)
+        except NotFoundError:
+            return False
+        return info.type == fileservice_pb2.DIRECTORY
+
+    async def get_file_mtime(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """Return the modification time as a datetime, or None if absent."""
+        try:
+            return (await self.stat(uid, user=user, tenant=tenant, roles=roles, claims=claims)).modified_at
+        except NotFoundError:
+            return None
+
+    async def get_folder_cdate(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """Return the creation time as a datetime, or None if absent."""
+        try:
+            return (await self.stat(uid, user=user, tenant=tenant, roles=roles, claims=claims)).created_at
+        except NotFoundError:
+            return None
+
+    async def file_name(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> list:
+        """Return ``[name]`` for the entity, or ``[]`` if it does not exist."""
+        try:
+            return [(await self.stat(uid, user=user, tenant=tenant, roles=roles, claims=claims)).name]
+        except NotFoundError:
+            return []
+
+    async def get_parent(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> str:
+        """Return the parent UID (empty string for root), or '' if absent."""
+        try:
+            return (await self.stat(uid, user=user, tenant=tenant, roles=roles, claims=claims)).parent_uid
+        except NotFoundError:
+            return ""
+
+    # ------------------------------------------------------------------ #
+    # File manipulation
+    # ------------------------------------------------------------------ #
+    async def move(self, source_uid: str, destination_uid: str, new_name: str = None, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Move an entity under a new parent (optionally renaming it)."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("Move", fileservice_pb2.MoveRequest(
+            source_uid=source_uid, destination_parent_uid=destination_uid, auth=auth),
+            "move", source_uid)
+        if new_name:
+            await self.rename(source_uid, new_name, user=user, tenant=tenant, roles=roles, claims=claims)
+        return True
+
+    async def copy(self, source_uid: str, destination_uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Copy an entity under a new parent (recursive for directories)."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("Copy", fileservice_pb2.CopyRequest(
+            source_uid=source_uid, destination_parent_uid=destination_uid, auth=auth),
+            "copy", source_uid)
+        return True
+
+    async def rename(self, uid: str, new_name: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Rename an entity in place."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("Rename", fileservice_pb2.RenameRequest(
+            uid=uid, new_name=new_name, auth=auth), "rename", uid)
+        return True
+
+    async def remove(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None,
+                     is_dir: bool = None) -> bool:
+        """Soft-delete an entity (RemoveDirectory for directories, else RemoveFile).
+
+        The type is looked up with a Stat unless ``is_dir`` is given; a Stat
+        the server refuses falls back to RemoveFile.
+        """
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        if is_dir is None:
+            try:
+                info = await self.stub.Stat(fileservice_pb2.StatRequest(uid=uid, auth=auth))
+            except grpc.RpcError as e:
+                _raise_rpc(e, "remove", uid)
+            is_dir = info.success and info.info.type == fileservice_pb2.DIRECTORY
+        if is_dir:
+            await self._call("RemoveDirectory", fileservice_pb2.RemoveDirectoryRequest(
+                uid=uid, auth=auth), "remove", uid)
+        else:
+            await self._call("RemoveFile", fileservice_pb2.RemoveFileRequest(
+                uid=uid, auth=auth), "remove", uid)
+        return True
+
+    async def undelete_file(self, file_uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Restore a soft-deleted file."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("UndeleteFile", fileservice_pb2.UndeleteFileRequest(
+            uid=file_uid, auth=auth), "undelete_file", file_uid)
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Versioning
+    # ------------------------------------------------------------------ #
+    async def revisions(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> List[Revision]:
+        """Return the file's versions as ``Revision`` models, newest first."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("ListVersions", fileservice_pb2.ListVersionsRequest(
+            uid=uid, auth=auth), "revisions", uid, default_cls=NotFoundError)
+        return [Revision(version=ts, name=uid, user=auth.user) for ts in resp.versions]
+
+    async def revision_versions(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> List[str]:
+        """Return just the file's version timestamps, newest first."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("ListVersions", fileservice_pb2.ListVersionsRequest(
+            uid=uid, auth=auth), "revisions", uid, default_cls=NotFoundError)
+        return list(resp.versions)
+
+    async def get_version(self, uid: str, version_timestamp: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bytes:
+        """Read the content of one version, named by its timestamp."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("GetVersion", fileservice_pb2.GetVersionRequest(
+            uid=uid, version_timestamp=version_timestamp, auth=auth),
+            "get_version", uid, default_cls=NotFoundError)
+        return resp.data
+
+    async def get_versions(self, uid: str, version_timestamps: List[str] = None, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> dict:
+        """Read several versions concurrently; returns ``{version_timestamp: bytes}``
+        (every version, newest first, when no timestamps are given)."""
+        if version_timestamps is None:
+            version_timestamps = await self.revision_versions(uid, user, tenant, roles, claims)
+        datas = await _gather(self.get_version(uid, ts, user, tenant, roles, claims)
+                              for ts in version_timestamps)
+        return dict(zip(version_timestamps, datas))
+
+    async def restore_to_version(self, file_uid: str, version_timestamp: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """Restore a file to a prior version; returns the restored version."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("RestoreToVersion", fileservice_pb2.RestoreToVersionRequest(
+            uid=file_uid, version_timestamp=version_timestamp, auth=auth),
+            "restore_to_version", file_uid)
+        return resp.restored_version
+
+    async def purge_old_versions(self, file_uid: str, keep_count: int, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Purge old versions, keeping the ``keep_count`` most recent."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("PurgeOldVersions", fileservice_pb2.PurgeOldVersionsRequest(
+            uid=file_uid, keep_count=keep_count, auth=auth), "purge_old_versions", file_uid)
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Metadata
+    # ------------------------------------------------------------------ #
+    async def set_metadata_value(self, uid: str, key: str, value: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Set a metadata value."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        compression = _metadata_compression(value, self._compression)
+        await self._call("SetMetadata", fileservice_pb2.SetMetadataRequest(
+            uid=uid, key=key, value=value, auth=auth), "set_metadata_value", uid,
+            compression=compression)
+        return True
+
+    async def get_metadata_value(self, uid: str, name: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """Return a metadata value; raises NotFoundError if absent."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("GetMetadata", fileservice_pb2.GetMetadataRequest(
+            uid=uid, key=name, auth=auth), "get_metadata_value", uid, default_cls=NotFoundError)
+        return resp.value
+
+    async def get_metadata_values(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None,
+                                  materialize: bool = True) -> Mapping[str, str]:
+        """Return all metadata as a dict (the response's map if not ``materialize``)."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("GetAllMetadata", fileservice_pb2.GetAllMetadataRequest(
+            uid=uid, auth=auth), "get_metadata_values", uid, default_cls=NotFoundError)
+        return dict(resp.metadata) if materialize else resp.metadata
+
+    async def delete_metadata_value(self, uid: str, name: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Delete a metadata value."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("DeleteMetadata", fileservice_pb2.DeleteMetadataRequest(
+            uid=uid, key=name, auth=auth), "delete_metadata_value", uid)
+        return True
+
+    async def get_metadata_for_version(self, uid: str, version, key: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
+        """Return a versioned metadata value; raises NotFoundError if absent."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("GetMetadataForVersion", fileservice_pb2.GetMetadataForVersionRequest(
+            uid=uid, version_timestamp=str(version), key=key, auth=auth),
+            "get_metadata_for_version", uid, default_cls=NotFoundError)
+        return resp.value
+
+    async def get_all_metadata_for_version(self, uid: str, version, user: str = None, tenant: str = None, roles: list = None, claims: list = None,
+                                           materialize: bool = True) -> Mapping[str, str]:
+        """Return all versioned metadata as a dict (the response's map if not ``materialize``)."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("GetAllMetadataForVersion", fileservice_pb2.GetAllMetadataForVersionRequest(
+            uid=uid, version_timestamp=str(version), auth=auth),
+            "get_all_metadata_for_version", uid, default_cls=NotFoundError)
+        return dict(resp.metadata) if materialize else resp.metadata
+
+    async def get_metadata_batch(self, uid: str, version, keys: List[str], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> dict:
+        """Return ``{key: value}`` for the requested keys of one version in a
+        single call; keys the version does not carry are left out."""
+        metadata = await self.get_all_metadata_for_version(uid, version, user, tenant, roles, claims, materialize=False)
+        return {key: metadata[key] for key in keys if key in metadata}
+
+    async def delete_metadata_batch(self, uid: str, keys: List[str], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Delete several metadata keys of one entity concurrently."""
+        await _gather(self.delete_metadata_value(uid, key, user, tenant, roles, claims)
+                      for key in keys)
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Permissions / ACL
+    # ------------------------------------------------------------------ #
+    async def check_permission(self, resource_uid: str, required_permission, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Check whether the acting identity has a permission on a resource."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("CheckPermission", fileservice_pb2.CheckPermissionRequest(
+            resource_uid=resource_uid, required_permission=_coerce_permission(required_permission),
+            auth=auth), "check_permission", resource_uid)
+        return bool(resp.has_permission)
+
+    async def check_permission_batch(self, resource_uids: List[str], required_permission, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> Dict[str, bool]:
+        """Check one permission on several resources concurrently; returns
+        ``{resource_uid: has_permission}``. Calls overlap as streams on the
+        channel (see :meth:`gather_many`); the first failure is raised."""
+        resource_uids = list(resource_uids)
+        results = await self.gather_many("check_permission", resource_uids, required_permission,
+                                         user=user, tenant=tenant, roles=roles, claims=claims)
+        return dict(zip(resource_uids, results))
+
+    async def get_effective_permissions(self, resource_uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> list:
+        """Return the principal's effective permission names on a resource."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("GetEffectivePermissions", fileservice_pb2.GetEffectivePermissionsRequest(
+            resource_uid=resource_uid, auth=auth), "get_effective_permissions", resource_uid)
+        return [fileservice_pb2.Permission.Name(p) for p in resp.permissions]
+
+    async def grant_permission(self, resource_uid: str, principal: str, permission, effect="allow",
+                               user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Grant a permission to a principal on a resource."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("GrantPermission", fileservice_pb2.GrantPermissionRequest(
+            resource_uid=resource_uid, principal=principal,
+            permission=_coerce_permission(permission), effect=_coerce_effect(effect),
+            auth=auth), "grant_permission", resource_uid)
+        return True
+
+    async def revoke_permission(self, resource_uid: str, principal: str, permission, effect="allow",
+                                user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Revoke a previously granted permission."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("RevokePermission", fileservice_pb2.RevokePermissionRequest(
+            resource_uid=resource_uid, principal=principal,
+            permission=_coerce_permission(permission), effect=_coerce_effect(effect),
+            auth=auth), "revoke_permission", resource_uid)
+        return True
+
+    async def grant_permissions(self, grants: List[tuple], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Apply several ``(resource_uid, principal, permission[, effect])``
+        grants concurrently."""
+        await _gather(self.grant_permission(*g, user=user, tenant=tenant, roles=roles, claims=claims)
+                      for g in grants)
+        return True
+
+    async def revoke_permissions(self, grants: List[tuple], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Revoke several grants concurrently (mirror of :meth:`grant_permissions`)."""
+        await _gather(self.revoke_permission(*g, user=user, tenant=tenant, roles=roles, claims=claims)
+                      for g in grants)
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Role management
+    # ------------------------------------------------------------------ #
+    async def create_role(self, role: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Create a role."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("CreateRole", fileservice_pb2.CreateRoleRequest(role=role, auth=auth), "create_role")
+        return True
+
+    async def delete_role(self, role: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Delete a role."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("DeleteRole", fileservice_pb2.DeleteRoleRequest(role=role, auth=auth), "delete_role")
+        return True
+
+    async def assign_user_to_role(self, target_user: str, role: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Assign a user to a role."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("AssignUserToRole", fileservice_pb2.AssignUserToRoleRequest(
+            user=target_user, role=role, auth=auth), "assign_user_to_role")
+        return True
+
+    async def remove_user_from_role(self, target_user: str, role: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Remove a user from a role."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("RemoveUserFromRole", fileservice_pb2.RemoveUserFromRoleRequest(
+            user=target_user, role=role, auth=auth), "remove_user_from_role")
+        return True
+
+    async def get_roles_for_user(self, target_user: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> list:
+        """Return the roles assigned to a user."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("GetRolesForUser", fileservice_pb2.GetRolesForUserRequest(
+            user=target_user, auth=auth), "get_roles_for_user")
+        return list(resp.roles)
+
+    async def get_users_for_role(self, role: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> list:
+        """Return the users assigned to a role."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("GetUsersForRole", fileservice_pb2.GetUsersForRoleRequest(
+            role=role, auth=auth), "get_users_for_role")
+        return list(resp.users)
+
+    async def get_all_roles(self, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> list:
+        """Return all roles."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("GetAllRoles", fileservice_pb2.GetAllRolesRequest(auth=auth), "get_all_roles")
+        return list(resp.roles)
+
+    # ------------------------------------------------------------------ #
+    # Administrative
+    # ------------------------------------------------------------------ #
+    async def get_storage_usage(self, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> Optional[StorageUsage]:
+        """Return a ``StorageUsage`` model."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resp = await self._call("GetStorageUsage", fileservice_pb2.StorageUsageRequest(
+            auth=auth, tenant=(tenant if tenant is not None else self.tenant)), "get_storage_usage")
+        return StorageUsage(
+            total_space=resp.total_space,
+            used_space=resp.used_space,
+            available_space=resp.available_space,
+            usage_percentage=resp.usage_percentage,
+        )
+
+    async def trigger_sync(self, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Trigger object-store synchronization for the tenant."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        await self._call("TriggerSync", fileservice_pb2.TriggerSyncRequest(
+            tenant=(tenant if tenant is not None else self.tenant), auth=auth), "trigger_sync")
+        return True
+
+    # ------------------------------------------------------------------ #
+    # Fan-out
+    # ------------------------------------------------------------------ #
+    async def gather_many(self, op: str, uids, *args, limit: int = 64, **kwargs) -> list:
+        """Call method ``op`` once per UID concurrently, keeping at most
+        ``limit`` calls in flight; return the results in ``uids`` order.
+
+        Extra positional and keyword arguments are passed to every call, e.g.
+        ``await mf.gather_many("stat", uids, user="bob")``. The first failure
+        cancels the calls still pending and is raised once they have stopped.
+        """
+        method = getattr(self, op, None) if not op.startswith('_') else None
+        if op == "gather_many" or not inspect.iscoroutinefunction(method):
+            raise InvalidRequestError(f"unknown operation {op!r}", operation="gather_many")
+        sem = asyncio.Semaphore(limit)
+
+        async def one(uid):
+            async with sem:
+                return await method(uid, *args, **kwargs)
+        return await _gather(one(uid) for uid in uids)
@@ -0,0 +1,72 @@
+"""
+Client-side caching for the FileEngine client.
+
+:class:`TTLCache` is a small thread-safe LRU whose entries expire after a fixed
+time-to-live. Entries are grouped by entity UID so that a write to an entity
+can drop everything cached about it in one step.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+__all__ = ["TTLCache"]
+
+
+class TTLCache:
+    """An LRU of ``uid -> {key: value}`` whose values expire after ``ttl`` seconds.
+
+    ``maxsize`` bounds the number of UIDs held; the least recently used UID is
+    evicted first. ``get`` returns None on a miss, so None cannot be cached.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 2.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, uid, key):
+        """Return the live value cached for ``(uid, key)``, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entries = self._data.get(uid)
+            if entries is None:
+                return None
+            hit = entries.get(key)
+            if hit is None:
+                return None
+            expires, value = hit
+            if expires <= now:
+                del entries[key]
+                if not entries:
+                    del self._data[uid]
+                return None
+            self._data.move_to_end(uid)
+            return value
+
+    def put(self, uid, key, value):
+        """Cache ``value`` for ``(uid, key)`` for the next ``ttl`` seconds."""
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            entries = self._data.get(uid)
+            if entries is None:
+                entries = self._data[uid] = {}
+            else:
+                self._data.move_to_end(uid)
+            entries[key] = (expires, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, uid):
+        """Drop everything cached for ``uid``."""
+        with self._lock:
+            self._data.pop(uid, None)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
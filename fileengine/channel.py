@@ -0,0 +1,217 @@
+"""
+gRPC channel management for the FileEngine client.
+
+A gRPC channel is one HTTP/2 connection that multiplexes every RPC issued over
+it, so opening one per :class:`~fileengine.ManagedFiles` instance repeats the
+TCP/HTTP/2 handshake (and costs a file descriptor) for no benefit. By default
+clients therefore share one channel per server address. Clients hold a
+reference to it (:func:`acquire_shared_channel` / :func:`release_shared_channel`);
+once the last one is released the channel lingers for
+``SHARED_CHANNEL_IDLE_SECONDS`` before it is closed, so short-lived clients
+created back to back keep reusing one connection without pinning a file
+descriptor forever.
+
+Under heavy concurrency a single connection becomes the ceiling (one TCP
+congestion window, per-connection flow control, head-of-line blocking). A
+:class:`ChannelPool` spreads calls round-robin over several independent
+connections instead.
+"""
+
+import json
+import threading
+
+import grpc
+
+from . import fileservice_pb2_grpc
+
+__all__ = [
+    "CHANNEL_OPTIONS", "SHARED_CHANNEL_IDLE_SECONDS", "get_shared_channel",
+    "acquire_shared_channel", "release_shared_channel", "close_shared_channels",
+    "ChannelPool",
+]
+
+# Allow large file payloads on unary RPCs (GetFile/GetVersion return the whole
+# file in one message). gRPC's default 4 MiB receive cap otherwise silently
+# fails reads of larger files; match the core's 64 MiB limit. Keepalive pings
+# (only while calls are active) detect a dead connection on long transfers.
+# Large file transfers are also held back by HTTP/2 flow control on
+# high-latency links: start each stream with a 16 MiB receive window (gRPC's
+# BDP probing still adjusts it) and allow the largest frames HTTP/2 permits.
+# Read-only RPCs are retried by gRPC itself when the server is briefly
+# UNAVAILABLE (restart, failover): the retry happens below the client, with
+# backoff, before any error surfaces. Mutating RPCs are never retried
+# automatically, since the first attempt may have been applied.
+_READ_ONLY_RPCS = (
+    "ListDirectory", "ListDirectoryWithDeleted", "GetFile", "Stat", "Exists",
+    "ListVersions", "GetVersion", "GetMetadata", "GetAllMetadata",
+    "GetMetadataForVersion", "GetAllMetadataForVersion", "CheckPermission",
+    "GetEffectivePermissions", "GetResourceAcls", "GetRolesForUser",
+    "GetUsersForRole", "GetAllRoles", "ListClaims", "StreamFileDownload",
+    "GetStorageUsage",
+)
+SERVICE_CONFIG = json.dumps({"methodConfig": [{
+    "name": [{"service": "fileengine_rpc.FileService", "method": m} for m in _READ_ONLY_RPCS],
+    "retryPolicy": {
+        "maxAttempts": 4,
+        "initialBackoff": "0.1s",
+        "maxBackoff": "2s",
+        "backoffMultiplier": 2,
+        "retryableStatusCodes": ["UNAVAILABLE"],
+    },
+}]})
+
+CHANNEL_OPTIONS = (
+    ("grpc.service_config", SERVICE_CONFIG),
+    ("grpc.max_receive_message_length", 64 * 1024 * 1024),
+    ("grpc.max_send_message_length", 64 * 1024 * 1024),
+    ("grpc.http2.lookahead_bytes", 16 * 1024 * 1024),
+    ("grpc.http2.max_frame_size", 16 * 1024 * 1024 - 1),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.http2.max_pings_without_data", 0),
+)
+
+
+# Seconds an unreferenced shared channel stays open before it is closed.
+SHARED_CHANNEL_IDLE_SECONDS = 300.0
+
+
+class _SharedChannel:
+    __slots__ = ("channel", "refs", "pinned", "timer")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.refs = 0
+        self.pinned = False   # handed out by get_shared_channel(): never closed
+        self.timer = None     # pending idle close, if any
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def _shared_entry(server_address):
+    """Return the entry for ``server_address``, creating it (lock held)."""
+    entry = _shared.get(server_address)
+    if entry is None:
+        entry = _shared[server_address] = _SharedChannel(
+            grpc.insecure_channel(server_address, options=list(CHANNEL_OPTIONS)))
+    return entry
+
+
+def get_shared_channel(server_address: str) -> grpc.Channel:
+    """Return the process-wide channel for ``server_address``, creating it on
+    first use. A channel obtained this way stays open for the life of the
+    process and must not be closed by the caller."""
+    with _shared_lock:
+        entry = _shared_entry(server_address)
+        entry.pinned = True
+        return entry.channel
+
+
+def acquire_shared_channel(server_address: str) -> grpc.Channel:
+    """Take a reference to the shared channel for ``server_address``. Pair
+    every call with one :func:`release_shared_channel`."""
+    return _acquire_shared(server_address).channel
+
+
+def release_shared_channel(server_address: str):
+    """Drop a reference taken by :func:`acquire_shared_channel`. The last
+    release schedules the channel to close after ``SHARED_CHANNEL_IDLE_SECONDS``
+    unless it is acquired again in the meantime."""
+    with _shared_lock:
+        entry = _shared.get(server_address)
+    if entry is not None:
+        _release_shared(server_address, entry)
+
+
+def _acquire_shared(server_address):
+    """Take a reference to the shared entry for ``server_address`` and return
+    the entry itself, for a later :func:`_release_shared`."""
+    with _shared_lock:
+        entry = _shared_entry(server_address)
+        entry.refs += 1
+        if entry.timer is not None:
+            entry.timer.cancel()
+            entry.timer = None
+        return entry
+
+
+def _release_shared(server_address, entry):
+    """Drop one reference to ``entry``. An entry that :func:`close_shared_channels`
+    already discarded (its channel is closed) is never touched again, so a
+    stale reference cannot release the channel that replaced it."""
+    with _shared_lock:
+        if entry.refs == 0 or _shared.get(server_address) is not entry:
+            return
+        entry.refs -= 1
+        if entry.refs or entry.pinned:
+            return
+        entry.timer = threading.Timer(SHARED_CHANNEL_IDLE_SECONDS, _close_idle,
+                                      (server_address, entry))
+        entry.timer.daemon = True
+        entry.timer.start()
+
+
+def close_shared_channels():
+    """Close every shared channel now, e.g. at process exit or before a fork.
+    Clients still holding one fail their next RPC; new clients open a fresh
+    channel."""
+    with _shared_lock:
+        entries = list(_shared.values())
+        _shared.clear()
+    for entry in entries:
+        if entry.timer is not None:
+            entry.timer.cancel()
+        entry.channel.close()
+
+
+def _close_idle(server_address, entry):
+    with _shared_lock:
+        # Re-acquired (or replaced) while the timer was firing: keep it.
+        if entry.refs or entry.pinned or _shared.get(server_address) is not entry:
+            return
+        del _shared[server_address]
+    entry.channel.close()
+
+
+class ChannelPool:
+    """A fixed set of channels to one server, each with its own connection.
+
+    Stubs are built once per channel; :meth:`next_stub` hands them out
+    round-robin, so concurrent callers spread their streams across the pool.
+    Pass the pool to ``ManagedFiles(channel_pool=...)``; several clients may
+    share one pool. The creator owns it and should :meth:`close` it when done.
+    """
+
+    def __init__(self, server_address: str, size: int = 4):
+        if size < 1:
+            raise ValueError("ChannelPool size must be at least 1")
+        # A local subchannel pool stops gRPC from collapsing the channels onto
+        # one shared connection to the same target.
+        options = list(CHANNEL_OPTIONS) + [("grpc.use_local_subchannel_pool", 1)]
+        self.server_address = server_address
+        self.channels = [grpc.insecure_channel(server_address, options=options)
+                         for _ in range(size)]
+        self.stubs = [fileservice_pb2_grpc.FileServiceStub(ch) for ch in self.channels]
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.channels)
+
+    def next_index(self) -> int:
+        """Return the pool index for the next call (thread-safe round-robin)."""
+        with self._lock:
+            i = self._next
+            self._next = (i + 1) % len(self.channels)
+        return i
+
+    def next_stub(self):
+        """Return the FileService stub for the next call."""
+        return self.stubs[self.next_index()]
+
+    def close(self):
+        """Close every channel in the pool."""
+        for ch in self.channels:
+            ch.close()
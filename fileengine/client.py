@@ -14,14 +14,20 @@ the all-zeros UUID ``00000000-0000-0000-0000-000000000000``.
 
 import grpc
 import io
+import operator
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Mapping, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 from . import fileservice_pb2
 from . import fileservice_pb2_grpc
+from .cache import TTLCache
+from .channel import CHANNEL_OPTIONS, ChannelPool, _acquire_shared, _release_shared
 from .exceptions import (
     FileEngineError, FileSystemError,
     ServerUnreachableError, ServiceUnavailableError, WriteUnavailableError,
@@ -32,6 +38,38 @@ from .exceptions import (
 ROOT_UID = ""
 ZERO_UID = "00000000-0000-0000-0000-000000000000"
 
+# Upper bound on concurrent in-flight calls issued by ManagedFiles.batch().
+_BATCH_MAX_WORKERS = 8
+
+# The read-only methods ManagedFiles.batch() may run. Mutators and methods that
+# change client state are excluded: batched calls run concurrently, in no
+# fixed order.
+_BATCH_OPERATIONS = frozenset({
+    "dir", "dir_columns", "list_deleted", "list_renditions", "get", "get_bytes",
+    "entity_exists", "stat", "is_dir", "get_file_mtime", "get_folder_cdate",
+    "file_name", "get_parent",
+    "revisions", "revision_versions", "get_version", "get_versions",
+    "get_metadata_value", "get_metadata_values", "get_metadata_for_version",
+    "get_all_metadata_for_version", "get_metadata_batch",
+    "check_permission", "get_effective_permissions", "get_roles_for_user",
+    "get_users_for_role", "get_all_roles", "get_storage_usage",
+})
+
+# put() payloads larger than this are uploaded over StreamFileUpload in chunks
+# of this size, bounding per-message memory and letting serialization overlap
+# the network; smaller payloads go in a single unary PutFile.
+_UPLOAD_CHUNK_BYTES = 256 * 1024
+
+# Wire compression for put() payloads and large metadata values, selected by
+# the ``compression`` constructor argument. Payloads smaller than _MIN_COMPRESS_BYTES are always
+# sent uncompressed: below ~1 KiB the gzip framing outweighs the saving.
+_COMPRESSION = {
+    "none": None,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+_MIN_COMPRESS_BYTES = 1024
+
 # Single-letter permission aliases, matching the CLI.
 _PERM_LETTERS = {
     'r': 'READ', 'w': 'WRITE', 'x': 'EXECUTE', 'd': 'DELETE',
@@ -183,8 +221,207 @@ def _safe_dt(ts):
     return None
 
 
+# Optional DirectoryEntry fields and how each is read off the proto entry, for
+# listings that materialize only some of them (``dir(fields=...)``).
+_ENTRY_FIELDS = {
+    "type": lambda e: e.type,
+    "size": lambda e: e.size,
+    "created_at": lambda e: _safe_dt(e.created_at),
+    "modified_at": lambda e: _safe_dt(e.modified_at),
+    "version_count": lambda e: e.version_count,
+    "rendition_count": lambda e: e.rendition_count,
+    "deleted": lambda e: e.deleted,
+    "owner": lambda e: e.owner,
+    "created_by": lambda e: e.created_by,
+    "modified_by": lambda e: e.modified_by,
+}
+
+
+def _entry_converter(fields):
+    """Return a proto-entry -> DirectoryEntry function that fills only ``fields``
+    (plus ``uid`` and ``name``); all fields when ``fields`` is None."""
+    if fields is None:
+        return _to_directory_entry
+    unknown = set(fields) - set(_ENTRY_FIELDS) - {"uid", "name"}
+    if unknown:
+        raise InvalidRequestError(f"unknown DirectoryEntry fields: {sorted(unknown)}",
+                                  operation="dir")
+    getters = [(f, _ENTRY_FIELDS[f]) for f in fields if f in _ENTRY_FIELDS]
+    return lambda e: DirectoryEntry(uid=e.uid, name=e.name, **{f: get(e) for f, get in getters})
+
+
+def _column_getters(columns):
+    """Return ``{column: getter}`` for a ``dir_columns`` call."""
+    unknown = set(columns) - set(_ENTRY_FIELDS) - {"uid", "name"}
+    if unknown:
+        raise InvalidRequestError(f"unknown DirectoryEntry fields: {sorted(unknown)}",
+                                  operation="dir")
+    return {c: _ENTRY_FIELDS.get(c) or operator.attrgetter(c) for c in columns}
+
+
+def _to_directory_entry(e):
+    """Convert a proto ``DirectoryEntry`` to the :class:`DirectoryEntry` model."""
+    return DirectoryEntry(
+        uid=e.uid, name=e.name, type=e.type, size=e.size,
+        created_at=_safe_dt(e.created_at),
+        modified_at=_safe_dt(e.modified_at),
+        version_count=e.version_count,
+        rendition_count=e.rendition_count,
+        deleted=e.deleted,
+        owner=e.owner,
+        created_by=e.created_by,
+        modified_by=e.modified_by,
+    )
+
+
+def _to_file_info(i):
+    """Convert a proto ``FileInfo`` to the :class:`FileInfo` model."""
+    return FileInfo(
+        uid=i.uid, name=i.name, parent_uid=i.parent_uid, type=i.type,
+        size=i.size, owner=i.owner, permissions=i.permissions,
+        created_at=_safe_dt(i.created_at),
+        modified_at=_safe_dt(i.modified_at),
+        version=i.version,
+        rendition_count=i.rendition_count)
+
+
+def _upload_chunks(uid, auth, payload):
+    """Yield the ``PutFileRequest`` chunks streaming ``payload`` to ``uid``.
+
+    Chunks are sliced from a memoryview, so the only copy made is each
+    chunk's own ``bytes`` (the protobuf runtime accepts nothing else).
+    """
+    view = memoryview(payload).cast('B')
+    total = (len(view) + _UPLOAD_CHUNK_BYTES - 1) // _UPLOAD_CHUNK_BYTES
+    for index in range(total):
+        start = index * _UPLOAD_CHUNK_BYTES
+        yield fileservice_pb2.PutFileRequest(
+            uid=uid, auth=auth, data=view[start:start + _UPLOAD_CHUNK_BYTES].tobytes(),
+            chunk_index=index, total_chunks=total)
+
+
+def _read_full(f, n):
+    """Read up to ``n`` bytes from ``f``, retrying short reads; fewer bytes
+    come back only at end of file."""
+    data = f.read(n) or b""
+    if len(data) == n:
+        return data
+    parts, got = [data], len(data)
+    while got < n:
+        more = f.read(n - got)
+        if not more:
+            break
+        parts.append(more)
+        got += len(more)
+    return b"".join(parts)
+
+
+class _FileChunks:
+    """The ``PutFileRequest`` chunks streaming ``size`` bytes read from ``f``.
+
+    ``total_chunks`` is fixed from ``size`` up front, so a file that ends
+    early stops the iterator with an :class:`InvalidRequestError` rather than
+    streaming a truncated body. gRPC reports that as an opaque error on the
+    call; the cause is kept in ``error`` for ``put`` to raise instead.
+    """
+
+    def __init__(self, uid, auth, f, size):
+        self.uid, self.auth, self.f, self.size = uid, auth, f, size
+        self.total = (size + _UPLOAD_CHUNK_BYTES - 1) // _UPLOAD_CHUNK_BYTES
+        self.error = None
+        self._index = 0
+
+    def _want(self, index):
+        return min(_UPLOAD_CHUNK_BYTES, self.size - index * _UPLOAD_CHUNK_BYTES)
+
+    def _request(self, index, data):
+        want = self._want(index)
+        if len(data) < want:
+            sent = index * _UPLOAD_CHUNK_BYTES + len(data)
+            self.error = InvalidRequestError(
+                f"file ended after {sent} of {self.size} bytes", operation="put", uid=self.uid)
+            raise self.error
+        return fileservice_pb2.PutFileRequest(
+            uid=self.uid, auth=self.auth, data=data,
+            chunk_index=index, total_chunks=self.total)
+
+    def _next_index(self):
+        index = self._index
+        if index >= self.total:
+            return None
+        self._index += 1
+        return index
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        index = self._next_index()
+        if index is None:
+            raise StopIteration
+        return self._request(index, _read_full(self.f, self._want(index)))
+
+
+def _remaining_size(f):
+    """Bytes left to read in a seekable file object, or None if not seekable."""
+    try:
+        if not f.seekable():
+            return None
+        pos = f.tell()
+        end = f.seek(0, io.SEEK_END)
+        f.seek(pos)
+    except (AttributeError, OSError):
+        return None
+    return end - pos
+
+
+def _upload_source(uid, auth, payload):
+    """Normalize a ``put`` payload to ``(size, chunks, data)``.
+
+    ``chunks`` is a ``PutFileRequest`` iterator when the payload should be
+    streamed (over 256 KiB), else None and ``data`` holds the bytes for one
+    ``PutFile``. Any bytes-like object is accepted; ``str`` is encoded as
+    UTF-8. A seekable binary file is streamed straight from the file; other
+    file objects are read whole.
+    """
+    if payload is None:
+        payload = b""
+    if hasattr(payload, "read"):
+        size = _remaining_size(payload)
+        if size is not None and size > _UPLOAD_CHUNK_BYTES:
+            return size, _FileChunks(uid, auth, payload, size), None
+        payload = payload.read()
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    size = memoryview(payload).nbytes
+    if size > _UPLOAD_CHUNK_BYTES:
+        return size, _upload_chunks(uid, auth, payload), None
+    return size, None, payload if type(payload) is bytes else bytes(payload)
+
+
+def _compression_for(name):
+    """Map a ``compression`` argument to a ``grpc.Compression`` (or None)."""
+    try:
+        return _COMPRESSION[name or "none"]
+    except KeyError:
+        raise ValueError(f"compression must be one of {sorted(_COMPRESSION)}, not {name!r}") from None
+
+
+def _metadata_compression(value, compression):
+    """The compression for a metadata ``value``: ``compression`` once its UTF-8
+    encoding reaches _MIN_COMPRESS_BYTES (the same threshold ``put`` uses)."""
+    n = len(value)
+    if compression is None or n * 4 < _MIN_COMPRESS_BYTES:   # <= 4 bytes per character
+        return None
+    if n >= _MIN_COMPRESS_BYTES or len(value.encode('utf-8')) >= _MIN_COMPRESS_BYTES:
+        return compression
+    return None
+
+
 def _coerce_permission(perm):
     """Accept a proto Permission int, an enum name, or a single letter."""
+    if type(perm) is int:   # the common case: fileengine.Permission.READ etc.
+        return perm
     if isinstance(perm, str):
         key = perm.strip()
         if len(key) == 1 and key.lower() in _PERM_LETTERS:
@@ -200,63 +437,44 @@ def _coerce_effect(effect):
     return int(effect)
 
 
-class ManagedFiles:
-    """
-    Python adapter for the FileEngine gRPC service that provides a
-    filesystem-like interface.
+def _freeze(value):
+    """A hashable stand-in for a roles/claims argument (lists, tuples, dicts)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return frozenset(value.items())
+    return value
 
-    Authentication is the trusted-upstream model: the user, roles, tenant and
-    claims supplied here are sent verbatim in every request's
-    ``AuthenticationContext``. Creating directly under the filesystem root, and
-    role/ACL administration, require the ``system_admin`` role.
+
+class _ClientIdentity:
+    """The acting identity shared by the sync and async clients: the default
+    user, roles, claims, tenant and source address, and the per-request
+    ``AuthenticationContext`` built from them.
+
+    The context for the default identity is built once and reused by every
+    call that passes no overrides, and the contexts for the most recent
+    distinct per-call overrides are kept too. Assigning any identity attribute
+    discards them all. (Mutating the ``roles``/``claims`` lists in place is not
+    seen — assign a new list, use :meth:`set_user_information`, or call
+    :meth:`invalidate_auth_cache`.)
     """
 
-    def __init__(self, db_interface=None, storage_base: str = None, user_roles: list = None,
-                 user_name: str = '', log_access: bool = False, permission_resolver=None,
-                 s3_config: dict = None, server_address: str = "localhost:50051",
-                 tenant: str = "", user_claims: list = None, source_addr: str = ""):
-        """
-        Initialize ManagedFiles with a gRPC client.
+    _IDENTITY_ATTRS = frozenset(("user", "roles", "claims", "tenant", "source_addr"))
+    _AUTH_CACHE_SIZE = 32
 
-        Args:
-            user_roles: User roles for permissions (default: [])
-            user_name: Username for operations
-            server_address: gRPC server address (host:port)
-            tenant: Tenant for operations (default: "" -> 'default' tenant)
-            user_claims: Additional user claims (list of str / (k, v) / dict)
-            db_interface/storage_base/log_access/permission_resolver/s3_config:
-                accepted for backward-compatibility; ignored.
-        """
+    def __setattr__(self, name, value):
+        if name in self._IDENTITY_ATTRS:
+            self.invalidate_auth_cache()
+        super().__setattr__(name, value)
+
+    def _init_identity(self, user_name, user_roles, user_claims, tenant, source_addr):
+        self._auth_lock = threading.Lock()
         self.user = user_name or 'user'
         self.roles = user_roles or []
         self.claims = user_claims or []
         self.source_addr = source_addr or ''  # client IP forwarded to the core for audit
-        self.log_access = log_access
-        self.permissions = permission_resolver
         self.tenant = tenant
 
-        # Allow large file payloads on unary RPCs (GetFile/GetVersion return the
-        # whole file in one message). gRPC's default 4 MiB receive cap otherwise
-        # silently fails reads of larger files; match the core's 64 MiB limit.
-        # (get() also streams via StreamFileDownload, which is unaffected by this.)
-        channel_options = [
-            ("grpc.max_receive_message_length", 64 * 1024 * 1024),
-            ("grpc.max_send_message_length", 64 * 1024 * 1024),
-        ]
-        self.channel = grpc.insecure_channel(server_address, options=channel_options)
-        self.stub = fileservice_pb2_grpc.FileServiceStub(self.channel)
-
-    def close(self):
-        """Close the gRPC connection."""
-        if hasattr(self, 'channel'):
-            self.channel.close()
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
-
     def set_user_information(self, user_name: str = None, roles: list = None, claims: list = None,
                              source_addr: str = None):
         """Set the default user/roles/claims (+ client source IP) for subsequent ops."""
@@ -269,16 +487,47 @@ class ManagedFiles:
         if source_addr is not None:
             self.source_addr = source_addr
 
+    def invalidate_auth_cache(self):
+        """Discard the cached AuthenticationContexts, e.g. after modifying the
+        ``roles`` or ``claims`` list in place."""
+        self.__dict__["_default_auth"] = None
+        self.__dict__["_override_auth"] = OrderedDict()
+
     def set_permission_resolver(self, permission_resolver):
         """Retained for compatibility; permission resolution is server-side."""
         self.permissions = permission_resolver
 
-    # ------------------------------------------------------------------ #
-    # Internal helpers
-    # ------------------------------------------------------------------ #
     def _create_auth_context(self, user: str = None, tenant: str = None, roles: list = None,
                              claims: list = None, source_addr: str = None):
-        """Build an AuthenticationContext for a request."""
+        """Build an AuthenticationContext for a request.
+
+        The returned message may be shared between calls; do not modify it.
+        """
+        if user is None and tenant is None and roles is None and claims is None and source_addr is None:
+            auth = self.__dict__.get("_default_auth")
+            if auth is None:
+                auth = self._default_auth = self._build_auth_context()
+            return auth
+        try:
+            key = (user, tenant, _freeze(roles), _freeze(claims), source_addr)
+            hash(key)
+        except TypeError:   # e.g. a claim value that is itself a list
+            return self._build_auth_context(user, tenant, roles, claims, source_addr)
+        with self._auth_lock:
+            cache = self._override_auth
+            auth = cache.get(key)
+            if auth is not None:
+                cache.move_to_end(key)
+                return auth
+        auth = self._build_auth_context(user, tenant, roles, claims, source_addr)
+        with self._auth_lock:
+            cache = self._override_auth
+            cache[key] = auth
+            if len(cache) > self._AUTH_CACHE_SIZE:
+                cache.popitem(last=False)
+        return auth
+
+    def _build_auth_context(self, user=None, tenant=None, roles=None, claims=None, source_addr=None):
         actual_user = user or self.user
         actual_tenant = tenant if tenant is not None else self.tenant
         actual_roles = roles if roles is not None else self.roles
@@ -302,6 +551,198 @@ class ManagedFiles:
             source_addr=actual_source or "",
         )
 
+
+class ManagedFiles(_ClientIdentity):
+    """
+    Python adapter for the FileEngine gRPC service that provides a
+    filesystem-like interface.
+
+    Authentication is the trusted-upstream model: the user, roles, tenant and
+    claims supplied here are sent verbatim in every request's
+    ``AuthenticationContext``. Creating directly under the filesystem root, and
+    role/ACL administration, require the ``system_admin`` role.
+    """
+
+    def __init__(self, db_interface=None, storage_base: str = None, user_roles: list = None,
+                 user_name: str = '', log_access: bool = False, permission_resolver=None,
+                 s3_config: dict = None, server_address: str = "localhost:50051",
+                 tenant: str = "", user_claims: list = None, source_addr: str = "",
+                 channel: grpc.Channel = None, shared_channel: bool = True,
+                 channel_pool: ChannelPool = None, cache_ttl: float = 0.0,
+                 cache_size: int = 4096, compression: str = "none",
+                 prewarm: bool = False, channel_pool_size: int = 1):
+        """
+        Initialize ManagedFiles with a gRPC client.
+
+        Args:
+            user_roles: User roles for permissions (default: [])
+            user_name: Username for operations
+            server_address: gRPC server address: ``host:port``, or
+                ``unix:/path/to.sock`` for a server on the same host
+            tenant: Tenant for operations (default: "" -> 'default' tenant)
+            user_claims: Additional user claims (list of str / (k, v) / dict)
+            channel: An existing gRPC channel to issue RPCs over. The caller
+                keeps ownership; :meth:`close` leaves it open.
+            shared_channel: When no ``channel`` is given, reuse the process-wide
+                channel for ``server_address`` (default) instead of opening a
+                private one that :meth:`close` tears down. The shared channel
+                is closed a while after its last client closes.
+            channel_pool: A :class:`ChannelPool` to spread RPCs across
+                round-robin (mutually exclusive with ``channel``). The caller
+                keeps ownership.
+            channel_pool_size: When neither ``channel`` nor ``channel_pool``
+                is given, values above 1 open a private :class:`ChannelPool`
+                of that many connections, closed by :meth:`close`. Only worth
+                it when one connection's stream limit is the bottleneck; the
+                default (1) uses a single channel.
+            cache_ttl: Seconds to cache ``stat``, ``revisions``,
+                ``entity_exists`` and ``check_permission`` results (and the lookups built on them)
+                per entity and identity; 0 (default) disables caching.
+                ACL and role changes made through this client clear the
+                cache. This client's own writes invalidate the
+                affected entries, but changes made by other clients can be
+                seen up to ``cache_ttl`` late.
+            cache_size: Maximum number of entities held in the cache.
+            compression: ``"gzip"`` or ``"deflate"`` compresses ``put``
+                payloads and metadata values of 1 KiB or more on the wire; ``"none"`` (default)
+                sends them as-is. Worth enabling for text-like content over
+                slow links; already-compressed content only costs CPU.
+            prewarm: Connect during construction (see :meth:`wait_ready`)
+                rather than on the first RPC, so the connection handshake
+                is not charged to the first operation. Raises
+                :class:`ServerUnreachableError` if the server does not
+                answer within 5 seconds.
+            db_interface/storage_base/log_access/permission_resolver/s3_config:
+                accepted for backward-compatibility; ignored.
+        """
+        self._init_identity(user_name, user_roles, user_claims, tenant, source_addr)
+        self.log_access = log_access
+        self.permissions = permission_resolver
+
+        if channel is not None and channel_pool is not None:
+            raise ValueError("pass either channel or channel_pool, not both")
+        if channel_pool_size > 1 and (channel is not None or channel_pool is not None):
+            raise ValueError("channel_pool_size cannot be combined with channel or channel_pool")
+        self._owns_pool = False
+        if channel_pool is None and channel is None and channel_pool_size > 1:
+            channel_pool = ChannelPool(server_address, size=channel_pool_size)
+            self._owns_pool = True
+        self._pool = channel_pool
+        self._owns_channel = False
+        self._shared = None     # (server_address, entry) held on the shared channel
+        self._close_lock = threading.Lock()
+        if channel_pool is not None:
+            self.channel = channel_pool.channels[0]
+        elif channel is not None:
+            self.channel = channel
+        elif shared_channel:
+            entry = _acquire_shared(server_address)
+            self.channel = entry.channel
+            self._shared = (server_address, entry)
+        else:
+            self.channel = grpc.insecure_channel(server_address, options=list(CHANNEL_OPTIONS))
+            self._owns_channel = True
+        self._stub = fileservice_pb2_grpc.FileServiceStub(self.channel)
+        self._cache = TTLCache(cache_size, cache_ttl) if cache_ttl > 0 else None
+        self._compression = _compression_for(compression)
+        if prewarm:
+            try:
+                self.wait_ready()
+            except ServerUnreachableError:
+                self.close()
+                raise
+
+    @property
+    def stub(self):
+        """The FileService stub for the next RPC (round-robin over a pool)."""
+        if self._pool is not None:
+            return self._pool.next_stub()
+        return self._stub
+
+    def close(self):
+        """Close the gRPC connection if this client owns it, or release its
+        reference to the shared channel. Safe to call more than once, from
+        any thread.
+
+        Caller-supplied channels and pools stay open for their other users.
+        """
+        lock = getattr(self, '_close_lock', None)
+        if lock is None:    # __init__ did not get as far as opening a channel
+            return
+        with lock:
+            owned, self._owns_channel = self._owns_channel, False
+            owned_pool, self._owns_pool = self._owns_pool, False
+            shared, self._shared = self._shared, None
+        if owned:
+            self.channel.close()
+        if owned_pool:
+            self._pool.close()
+        if shared is not None:
+            _release_shared(*shared)
+
+    def start_connecting(self):
+        """Begin the connection handshake (on every connection, for a pool)
+        in the background and return at once, so it overlaps the caller's own
+        start-up instead of delaying the first RPC."""
+        for ch in self._channels():
+            grpc.channel_ready_future(ch)   # subscribing with try_to_connect starts it
+
+    def _channels(self):
+        return self._pool.channels if self._pool is not None else [self.channel]
+
+    def wait_ready(self, timeout: float = 5.0):
+        """Block until the connection (every connection, for a pool) is
+        established. Raises :class:`ServerUnreachableError` after ``timeout``
+        seconds."""
+        deadline = time.monotonic() + timeout
+        # Start every handshake first so the pool's connections come up in
+        # parallel, then wait on them against one shared deadline.
+        ready = [grpc.channel_ready_future(ch) for ch in self._channels()]
+        try:
+            for fut in ready:
+                fut.result(timeout=max(deadline - time.monotonic(), 0))
+        except grpc.FutureTimeoutError:
+            for fut in ready:
+                fut.cancel()
+            raise ServerUnreachableError(f"server not ready after {timeout}s",
+                                         operation="wait_ready") from None
+
+    def clear_cache(self):
+        """Drop every cached result (see ``cache_ttl``)."""
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _cached(self, uid, kind, auth, fetch):
+        """Return ``fetch()``, served from the TTL cache when enabled. Entries are
+        keyed by entity and by the serialized identity that read them."""
+        if self._cache is None:
+            return fetch()
+        key = (kind, auth.SerializeToString(deterministic=True))
+        value = self._cache.get(uid, key)
+        if value is None:
+            value = fetch()
+            self._cache.put(uid, key, value)
+        return value
+
+    def _invalidate(self, *uids):
+        """Drop cached results for entities this client just changed."""
+        if self._cache is not None:
+            for uid in uids:
+                if uid is not None:
+                    self._cache.invalidate(uid)
+
+    def _cached_parent(self, uid, auth):
+        """The parent of ``uid`` according to a cached stat, or None. Never
+        issues an RPC."""
+        info = self._cache.get(uid, ("stat", auth.SerializeToString(deterministic=True)))
+        return info.parent_uid if info is not None else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     # ------------------------------------------------------------------ #
     # Directory operations
     # ------------------------------------------------------------------ #
@@ -319,20 +760,57 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "mkdir", parent_uuid)
         _check(resp, "mkdir", parent_uuid)
+        self._invalidate(parent_uuid)
         return resp.uid
 
-    def dir(self, uid, show_deleted: bool = False, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> Union[List[DirectoryEntry], bool]:
+    def dir(self, uid, show_deleted: bool = False, user: str = None, tenant: str = None, roles: list = None, claims: list = None,
+            fields=None) -> Union[List[DirectoryEntry], bool]:
         """
         List directory contents.
 
         ``show_deleted`` routes to the dedicated ``ListDirectoryWithDeleted``
         RPC (plain ``ListDirectory`` filters soft-deleted entries server-side).
 
+        ``fields`` (an iterable of ``DirectoryEntry`` field names) fills only
+        those fields, plus ``uid`` and ``name``; the rest keep their defaults.
+        Large listings that need only names/types skip the per-entry timestamp
+        conversion this way.
+
         Returns a list of DirectoryEntry (uid, name, is_container, size, mtime,
         ctime, version_count). Raises a :class:`FileEngineError` subclass on
         failure (e.g. :class:`NotFoundError`, :class:`PermissionDeniedError`).
         """
+        return list(self.iter_dir(uid, show_deleted, user=user, tenant=tenant, roles=roles,
+                                  claims=claims, fields=fields))
+
+    def iter_dir(self, uid, show_deleted: bool = False, user: str = None, tenant: str = None, roles: list = None, claims: list = None,
+                 fields=None) -> Iterator[DirectoryEntry]:
+        """
+        Like :meth:`dir`, but return an iterator that converts entries as they
+        are consumed instead of building the whole list up front.
+
+        The listing RPC itself runs before this returns, so errors are raised
+        here rather than on first iteration.
+        """
+        convert = _entry_converter(fields)
         auth = self._create_auth_context(user, tenant, roles, claims)
+        return map(convert, self._list_entries(uid, show_deleted, auth))
+
+    def dir_columns(self, uid, columns=("uid", "name", "type", "size"), show_deleted: bool = False,
+                    user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> Dict[str, list]:
+        """
+        List directory contents column-wise: return ``{column: [value, ...]}``
+        with one list per requested ``DirectoryEntry`` field, all in listing
+        order. No per-entry model objects are built, so scanning or filtering a
+        large directory on a few fields is much cheaper than :meth:`dir`.
+        """
+        getters = _column_getters(columns)
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        entries = self._list_entries(uid, show_deleted, auth)
+        return {c: list(map(get, entries)) for c, get in getters.items()}
+
+    def _list_entries(self, uid, show_deleted, auth):
+        """Run the listing RPC and return the raw proto entries."""
         try:
             if show_deleted:
                 resp = self.stub.ListDirectoryWithDeleted(
@@ -343,25 +821,47 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "dir", uid)
         _check(resp, "dir", uid, default_cls=NotFoundError)
-        return [
-            DirectoryEntry(
-                uid=e.uid, name=e.name, type=e.type, size=e.size,
-                created_at=_safe_dt(e.created_at),
-                modified_at=_safe_dt(e.modified_at),
-                version_count=e.version_count,
-                rendition_count=e.rendition_count,
-                deleted=e.deleted,
-                owner=e.owner,
-                created_by=e.created_by,
-                modified_by=e.modified_by,
-            )
-            for e in resp.entries
-        ]
+        return resp.entries
 
     def list_deleted(self, uid, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
         """Convenience for ``dir(uid, show_deleted=True)``."""
         return self.dir(uid, show_deleted=True, user=user, tenant=tenant, roles=roles, claims=claims)
 
+    def ensure_path(self, path: str, create_file: bool = False, parent_uid: str = ROOT_UID,
+                    user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> List[str]:
+        """
+        Resolve a ``/``-separated path below ``parent_uid``, creating missing
+        components (``mkdir -p``). With ``create_file`` the last component is
+        a file (touched if missing); otherwise every component is a directory.
+
+        Returns the UID of each component, in path order. Each component is
+        created optimistically, so a fresh path costs one call per component;
+        only a component that already exists costs an extra listing to find
+        its UID.
+
+        Raises :class:`InvalidRequestError` for an empty path or when an
+        existing component has the wrong type.
+        """
+        names = [n for n in path.split("/") if n]
+        if not names:
+            raise InvalidRequestError("empty path", operation="ensure_path")
+        ident = dict(user=user, tenant=tenant, roles=roles, claims=claims)
+        uids, parent = [], parent_uid
+        for i, name in enumerate(names):
+            want_dir = not (create_file and i == len(names) - 1)
+            try:
+                parent = (self.mkdir if want_dir else self.touch)(parent, name, **ident)
+            except AlreadyExistsError:
+                found = next((e for e in self.iter_dir(parent, fields=("type",), **ident)
+                              if e.name == name), None)
+                if found is None or found.is_container != want_dir:
+                    raise InvalidRequestError(
+                        f"'{name}' exists but is not a {'directory' if want_dir else 'file'}",
+                        operation="ensure_path", uid=parent)
+                parent = found.uid
+            uids.append(parent)
+        return uids
+
     # ------------------------------------------------------------------ #
     # File operations
     # ------------------------------------------------------------------ #
@@ -378,12 +878,19 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "touch", container_uuid)
         _check(resp, "touch", container_uuid)
+        self._invalidate(container_uuid)
         return resp.uid
 
     def put(self, uid: str, payload=None, return_open: bool = False, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
         """
         Write a new version of a file's content.
 
+        ``payload`` is ``bytes``/``str`` or a binary file object. Payloads
+        over 256 KiB are streamed to the server in chunks
+        (``StreamFileUpload``); smaller ones go in a single ``PutFile``. A
+        seekable file is streamed as it is read, so it is never held in
+        memory whole.
+
         Returns a float timestamp of the write on success. Raises a
         :class:`FileEngineError` subclass on failure — notably
         :class:`WriteUnavailableError` if the server is temporarily read-only
@@ -391,17 +898,21 @@ class ManagedFiles:
         """
         if return_open:
             raise NotImplementedError("return_open is not supported in the gRPC client")
-        if payload is None:
-            payload = b""
-        if isinstance(payload, str):
-            payload = payload.encode('utf-8')
         auth = self._create_auth_context(user, tenant, roles, claims)
+        size, chunks, data = _upload_source(uid, auth, payload)
+        compression = self._compression if size >= _MIN_COMPRESS_BYTES else None
         try:
-            resp = self.stub.PutFile(fileservice_pb2.PutFileRequest(
-                uid=uid, auth=auth, data=payload))
+            if chunks is not None:
+                resp = self.stub.StreamFileUpload(chunks, compression=compression)
+            else:
+                resp = self.stub.PutFile(fileservice_pb2.PutFileRequest(
+                    uid=uid, auth=auth, data=data), compression=compression)
         except grpc.RpcError as e:
+            if getattr(chunks, "error", None) is not None:
+                raise chunks.error from None
             _raise_rpc(e, "put", uid)
         _check(resp, "put", uid)
+        self._invalidate(uid)
         return time.time()
 
     def get(self, uid: str, back: int = 0, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
@@ -409,33 +920,66 @@ class ManagedFiles:
         Read file content as a BytesIO. ``back`` selects how many versions back
         (0 = latest). Raises a :class:`FileEngineError` subclass on failure
         (e.g. :class:`NotFoundError` if the file or requested version is absent).
+
+        Use :meth:`get_bytes` for the content as ``bytes``, or :meth:`get_into`
+        to read into a reusable buffer.
         """
+        # BytesIO adopts the joined bytes without copying until it is written to.
+        return io.BytesIO(self.get_bytes(uid, back, user=user, tenant=tenant, roles=roles, claims=claims))
+
+    def get_bytes(self, uid: str, back: int = 0, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bytes:
+        """Read file content as ``bytes`` (see :meth:`get`)."""
+        return b"".join(self._iter_content(uid, back, user, tenant, roles, claims))
+
+    def iter_content(self, uid: str, back: int = 0, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> Iterator[bytes]:
+        """Yield file content in chunks as they arrive, never holding the
+        whole file (see :meth:`get`). The download starts, and errors are
+        raised, on first iteration; abandoning the iterator cancels it."""
+        return self._iter_content(uid, back, user, tenant, roles, claims)
+
+    def get_into(self, uid: str, out: bytearray, back: int = 0, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> int:
+        """Read file content into ``out``, replacing what it held; return its length.
+
+        Chunks are copied into ``out`` as they arrive, so no intermediate copy
+        of the whole file is made. They overwrite the existing contents in
+        place, so one buffer reused across many reads of similar-sized files
+        keeps its allocation instead of being emptied and regrown each time.
+        On failure ``out`` may hold a partial read.
+        """
+        pos = 0
+        for chunk in self._iter_content(uid, back, user, tenant, roles, claims):
+            end = pos + len(chunk)
+            out[pos:end] = chunk
+            pos = end
+        del out[pos:]
+        return pos
+
+    def _iter_content(self, uid, back, user, tenant, roles, claims):
+        """Yield the data chunks of a file version (``back`` versions back)."""
         auth = self._create_auth_context(user, tenant, roles, claims)
         try:
             if back == 0:
-                # Stream the latest version in chunks (no single-message size cap),
-                # accumulating into a BytesIO. An error frame (success=False) ends
-                # the stream; an empty file simply yields no data chunks.
-                buf = io.BytesIO()
+                # Stream the latest version in chunks (no single-message size
+                # cap). An error frame (success=False) ends the stream; an empty
+                # file simply yields no data chunks.
                 for resp in self.stub.StreamFileDownload(
                         fileservice_pb2.GetFileRequest(uid=uid, auth=auth)):
                     _check(resp, "get", uid, default_cls=NotFoundError)
                     if resp.data:
-                        buf.write(resp.data)
-                buf.seek(0)
-                return buf
+                        yield resp.data
+                return
 
-            versions = self.revisions(uid, user=user, tenant=tenant, roles=roles, claims=claims)
+            versions = self._list_versions(uid, auth)
             if not versions or len(versions) <= back:
                 raise NotFoundError(f"version {back} back does not exist",
                                     operation="get", uid=uid)
-            ts = versions[back].version
+            ts = versions[back]
             resp = self.stub.GetVersion(fileservice_pb2.GetVersionRequest(
                 uid=uid, version_timestamp=ts, auth=auth))
         except grpc.RpcError as e:
             _raise_rpc(e, "get", uid)
         _check(resp, "get", uid, default_cls=NotFoundError)
-        return io.BytesIO(resp.data)
+        yield resp.data
 
     def entity_exists(self, entity_uid: str, include_deleted: bool = False) -> bool:
         """Return True if the entity exists, False if it does not.
@@ -444,13 +988,16 @@ class ManagedFiles:
         — server unreachable, read-only window, auth/permission error — raises a
         :class:`FileEngineError` subclass.
         """
-        try:
-            resp = self.stub.Exists(fileservice_pb2.ExistsRequest(
-                uid=entity_uid, auth=self._create_auth_context()))
-        except grpc.RpcError as e:
-            _raise_rpc(e, "entity_exists", entity_uid)
-        _check(resp, "entity_exists", entity_uid)
-        return bool(resp.exists)
+        auth = self._create_auth_context()
+
+        def fetch():
+            try:
+                resp = self.stub.Exists(fileservice_pb2.ExistsRequest(uid=entity_uid, auth=auth))
+            except grpc.RpcError as e:
+                _raise_rpc(e, "entity_exists", entity_uid)
+            _check(resp, "entity_exists", entity_uid)
+            return bool(resp.exists)
+        return self._cached(entity_uid, "exists", auth, fetch)
 
     def stat(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> FileInfo:
         """Return a FileInfo for the entity.
@@ -459,20 +1006,19 @@ class ManagedFiles:
         :class:`FileEngineError` subclass on other failures. Use
         :meth:`entity_exists` for a non-raising existence check.
         """
-        auth = self._create_auth_context(user, tenant, roles, claims)
-        try:
-            resp = self.stub.Stat(fileservice_pb2.StatRequest(uid=uid, auth=auth))
-        except grpc.RpcError as e:
-            _raise_rpc(e, "stat", uid)
-        _check(resp, "stat", uid, default_cls=NotFoundError)
-        i = resp.info
-        return FileInfo(
-            uid=i.uid, name=i.name, parent_uid=i.parent_uid, type=i.type,
-            size=i.size, owner=i.owner, permissions=i.permissions,
-            created_at=_safe_dt(i.created_at),
-            modified_at=_safe_dt(i.modified_at),
-            version=i.version,
-            rendition_count=i.rendition_count)
+        # Hand out a copy so callers cannot mutate a cached model.
+        return self._stat(uid, self._create_auth_context(user, tenant, roles, claims)).model_copy()
+
+    def _stat(self, uid, auth) -> FileInfo:
+        """The (possibly cached) FileInfo for ``uid``; callers must not modify it."""
+        def fetch():
+            try:
+                resp = self.stub.Stat(fileservice_pb2.StatRequest(uid=uid, auth=auth))
+            except grpc.RpcError as e:
+                _raise_rpc(e, "stat", uid)
+            _check(resp, "stat", uid, default_cls=NotFoundError)
+            return _to_file_info(resp.info)
+        return self._cached(uid, "stat", auth, fetch)
 
     def list_renditions(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
         """List a file's hidden renditions (alternate-format children).
@@ -491,7 +1037,7 @@ class ManagedFiles:
         propagate as :class:`FileEngineError` subclasses.
         """
         try:
-            info = self.stat(uid, user=user, tenant=tenant, roles=roles, claims=claims)
+            info = self._stat(uid, self._create_auth_context(user, tenant, roles, claims))
         except NotFoundError:
             return False
         return info.type == fileservice_pb2.DIRECTORY
@@ -499,28 +1045,28 @@ class ManagedFiles:
     def get_file_mtime(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
         """Return the modification time as a datetime, or None if absent."""
         try:
-            return self.stat(uid, user=user, tenant=tenant, roles=roles, claims=claims).modified_at
+            return self._stat(uid, self._create_auth_context(user, tenant, roles, claims)).modified_at
         except NotFoundError:
             return None
 
     def get_folder_cdate(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
         """Return the creation time as a datetime, or None if absent."""
         try:
-            return self.stat(uid, user=user, tenant=tenant, roles=roles, claims=claims).created_at
+            return self._stat(uid, self._create_auth_context(user, tenant, roles, claims)).created_at
         except NotFoundError:
             return None
 
     def file_name(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> list:
         """Return ``[name]`` for the entity, or ``[]`` if it does not exist."""
         try:
-            return [self.stat(uid, user=user, tenant=tenant, roles=roles, claims=claims).name]
+            return [self._stat(uid, self._create_auth_context(user, tenant, roles, claims)).name]
         except NotFoundError:
             return []
 
     def get_parent(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> str:
         """Return the parent UID (empty string for root), or '' if absent."""
         try:
-            return self.stat(uid, user=user, tenant=tenant, roles=roles, claims=claims).parent_uid
+            return self._stat(uid, self._create_auth_context(user, tenant, roles, claims)).parent_uid
         except NotFoundError:
             return ""
 
@@ -540,6 +1086,13 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "move", source_uid)
         _check(resp, "move", source_uid)
+        if self._cache is not None:
+            old_parent = self._cached_parent(source_uid, auth)
+            if old_parent is None:
+                # The old parent is unknown without another round trip.
+                self.clear_cache()
+            else:
+                self._invalidate(source_uid, destination_uid, old_parent)
         if new_name:
             self.rename(source_uid, new_name, user=user, tenant=tenant, roles=roles, claims=claims)
         return True
@@ -556,6 +1109,7 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "copy", source_uid)
         _check(resp, "copy", source_uid)
+        self._invalidate(destination_uid)
         return True
 
     def rename(self, uid: str, new_name: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
@@ -567,18 +1121,32 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "rename", uid)
         _check(resp, "rename", uid)
+        self._invalidate(uid)
         return True
 
-    def remove(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+    def remove(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None,
+               is_dir: bool = None) -> bool:
         """
         Soft-delete an entity. Directories use RemoveDirectory, files use
         RemoveFile. Returns True on success; raises a :class:`FileEngineError`
         subclass on failure.
+
+        The entity type is looked up with a Stat (served from the cache when
+        ``cache_ttl`` is set); if the server refuses the Stat, e.g. because the
+        caller may delete but not stat the entity, RemoveFile is used. Callers
+        that already know the type, e.g. from a listing, pass ``is_dir`` to
+        skip that round trip.
         """
         auth = self._create_auth_context(user, tenant, roles, claims)
+        if is_dir is None:
+            try:
+                is_dir = self._stat(uid, auth).type == fileservice_pb2.DIRECTORY
+            except FileEngineError as e:
+                if e.status_code is not None:   # transport failure, not a refusal
+                    raise
+                is_dir = False
         try:
-            info = self.stub.Stat(fileservice_pb2.StatRequest(uid=uid, auth=auth))
-            if info.success and info.info.type == fileservice_pb2.DIRECTORY:
+            if is_dir:
                 resp = self.stub.RemoveDirectory(
                     fileservice_pb2.RemoveDirectoryRequest(uid=uid, auth=auth))
             else:
@@ -587,6 +1155,11 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "remove", uid)
         _check(resp, "remove", uid)
+        if is_dir:
+            # Cached results for anything underneath are now stale too.
+            self.clear_cache()
+        else:
+            self._invalidate(uid)
         return True
 
     def undelete_file(self, file_uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
@@ -598,6 +1171,7 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "undelete_file", file_uid)
         _check(resp, "undelete_file", file_uid)
+        self._invalidate(file_uid)
         return True
 
     # ------------------------------------------------------------------ #
@@ -610,12 +1184,62 @@ class ManagedFiles:
         :class:`NotFoundError` if the file does not exist).
         """
         auth = self._create_auth_context(user, tenant, roles, claims)
+        return [Revision(version=ts, name=uid, user=auth.user)
+                for ts in self._list_versions(uid, auth)]
+
+    def revision_versions(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> List[str]:
+        """Return just the file's version timestamps, newest first.
+
+        Same data as :meth:`revisions` without building a model per version,
+        for callers that only need the timestamps (e.g. to pick one for
+        :meth:`restore_to_version`).
+        """
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        return list(self._list_versions(uid, auth))
+
+    def get_version(self, uid: str, version_timestamp: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bytes:
+        """Read the content of one version, named by its timestamp (as
+        returned by :meth:`revision_versions`).
+
+        Unlike ``get(uid, back=N)`` this does not list the versions first, so
+        reading several versions costs one listing plus one call each.
+        """
+        auth = self._create_auth_context(user, tenant, roles, claims)
         try:
-            resp = self.stub.ListVersions(fileservice_pb2.ListVersionsRequest(uid=uid, auth=auth))
+            resp = self.stub.GetVersion(fileservice_pb2.GetVersionRequest(
+                uid=uid, version_timestamp=version_timestamp, auth=auth))
         except grpc.RpcError as e:
-            _raise_rpc(e, "revisions", uid)
-        _check(resp, "revisions", uid, default_cls=NotFoundError)
-        return [Revision(version=ts, name=uid, user=auth.user) for ts in resp.versions]
+            _raise_rpc(e, "get_version", uid)
+        _check(resp, "get_version", uid, default_cls=NotFoundError)
+        return resp.data
+
+    def get_versions(self, uid: str, version_timestamps: List[str] = None, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> Dict[str, bytes]:
+        """Read the content of several versions at once; returns
+        ``{version_timestamp: bytes}`` in the order given. Without
+        ``version_timestamps`` every version is read, newest first.
+
+        The reads are pipelined on the channel, so N versions cost about one
+        round trip (plus one listing when no timestamps are given). The first
+        failure is raised once all reads have finished.
+        """
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        if version_timestamps is None:
+            version_timestamps = self._list_versions(uid, auth)
+        resps = self._pipeline("GetVersion", "get_version", {
+            ts: fileservice_pb2.GetVersionRequest(uid=uid, version_timestamp=ts, auth=auth)
+            for ts in version_timestamps}, default_cls=NotFoundError, uid=uid)
+        return {ts: resp.data for ts, resp in resps.items()}
+
+    def _list_versions(self, uid, auth):
+        """The (possibly cached) ``ListVersions`` timestamps for ``uid``."""
+        def fetch():
+            try:
+                resp = self.stub.ListVersions(fileservice_pb2.ListVersionsRequest(uid=uid, auth=auth))
+            except grpc.RpcError as e:
+                _raise_rpc(e, "revisions", uid)
+            _check(resp, "revisions", uid, default_cls=NotFoundError)
+            return tuple(resp.versions)
+        return self._cached(uid, "revisions", auth, fetch)
 
     def restore_to_version(self, file_uid: str, version_timestamp: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None):
         """Restore a file to a prior version. Returns the restored version
@@ -628,6 +1252,7 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "restore_to_version", file_uid)
         _check(resp, "restore_to_version", file_uid)
+        self._invalidate(file_uid)
         return resp.restored_version
 
     def purge_old_versions(self, file_uid: str, keep_count: int, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
@@ -640,6 +1265,7 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "purge_old_versions", file_uid)
         _check(resp, "purge_old_versions", file_uid)
+        self._invalidate(file_uid)
         return True
 
     # ------------------------------------------------------------------ #
@@ -648,9 +1274,10 @@ class ManagedFiles:
     def set_metadata_value(self, uid: str, key: str, value: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
         """Set a metadata value. Returns True; raises on failure (write op)."""
         auth = self._create_auth_context(user, tenant, roles, claims)
+        compression = _metadata_compression(value, self._compression)
         try:
             resp = self.stub.SetMetadata(fileservice_pb2.SetMetadataRequest(
-                uid=uid, key=key, value=value, auth=auth))
+                uid=uid, key=key, value=value, auth=auth), compression=compression)
         except grpc.RpcError as e:
             _raise_rpc(e, "set_metadata_value", uid)
         _check(resp, "set_metadata_value", uid)
@@ -668,15 +1295,18 @@ class ManagedFiles:
         _check(resp, "get_metadata_value", uid, default_cls=NotFoundError)
         return resp.value
 
-    def get_metadata_values(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> dict:
-        """Return all metadata as a dict. Raises on failure (e.g. file absent)."""
+    def get_metadata_values(self, uid: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None,
+                            materialize: bool = True) -> Mapping[str, str]:
+        """Return all metadata as a dict. Raises on failure (e.g. file absent).
+        ``materialize=False`` returns the response's protobuf map as-is,
+        skipping the copy into a dict for large sets read once."""
         auth = self._create_auth_context(user, tenant, roles, claims)
         try:
             resp = self.stub.GetAllMetadata(fileservice_pb2.GetAllMetadataRequest(uid=uid, auth=auth))
         except grpc.RpcError as e:
             _raise_rpc(e, "get_metadata_values", uid)
         _check(resp, "get_metadata_values", uid, default_cls=NotFoundError)
-        return dict(resp.metadata)
+        return dict(resp.metadata) if materialize else resp.metadata
 
     def delete_metadata_value(self, uid: str, name: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
         """Delete a metadata value. Returns True; raises on failure (write op)."""
@@ -701,8 +1331,11 @@ class ManagedFiles:
         _check(resp, "get_metadata_for_version", uid, default_cls=NotFoundError)
         return resp.value
 
-    def get_all_metadata_for_version(self, uid: str, version, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> dict:
-        """Return all versioned metadata as a dict. Raises on failure."""
+    def get_all_metadata_for_version(self, uid: str, version, user: str = None, tenant: str = None, roles: list = None, claims: list = None,
+                                     materialize: bool = True) -> Mapping[str, str]:
+        """Return all versioned metadata as a dict. Raises on failure.
+        ``materialize=False`` returns the response's map without copying it
+        (see :meth:`get_metadata_values`)."""
         auth = self._create_auth_context(user, tenant, roles, claims)
         try:
             resp = self.stub.GetAllMetadataForVersion(fileservice_pb2.GetAllMetadataForVersionRequest(
@@ -710,7 +1343,24 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "get_all_metadata_for_version", uid)
         _check(resp, "get_all_metadata_for_version", uid, default_cls=NotFoundError)
-        return dict(resp.metadata)
+        return dict(resp.metadata) if materialize else resp.metadata
+
+    def get_metadata_batch(self, uid: str, version, keys: List[str], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> dict:
+        """Return ``{key: value}`` for the requested ``keys`` of one version in a
+        single round trip (one ``GetAllMetadataForVersion`` call rather than one
+        call per key). Keys the version does not carry are left out."""
+        metadata = self.get_all_metadata_for_version(uid, version, user, tenant, roles, claims, materialize=False)
+        return {key: metadata[key] for key in keys if key in metadata}
+
+    def delete_metadata_batch(self, uid: str, keys: List[str], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Delete several metadata keys of one entity. The deletes are pipelined
+        on the channel, so N keys cost about one round trip. Returns True; the
+        first failure (in ``keys`` order) is raised once all calls have finished."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        self._pipeline("DeleteMetadata", "delete_metadata_value", {
+            key: fileservice_pb2.DeleteMetadataRequest(uid=uid, key=key, auth=auth) for key in keys},
+            uid=uid)
+        return True
 
     # ------------------------------------------------------------------ #
     # Permissions / ACL
@@ -722,15 +1372,17 @@ class ManagedFiles:
         enum name, or a single letter (r/w/x/d/...).
         """
         auth = self._create_auth_context(user, tenant, roles, claims)
-        try:
-            resp = self.stub.CheckPermission(fileservice_pb2.CheckPermissionRequest(
-                resource_uid=resource_uid,
-                required_permission=_coerce_permission(required_permission),
-                auth=auth))
-        except grpc.RpcError as e:
-            _raise_rpc(e, "check_permission", resource_uid)
-        _check(resp, "check_permission", resource_uid)
-        return bool(resp.has_permission)
+        perm = _coerce_permission(required_permission)
+
+        def fetch():
+            try:
+                resp = self.stub.CheckPermission(fileservice_pb2.CheckPermissionRequest(
+                    resource_uid=resource_uid, required_permission=perm, auth=auth))
+            except grpc.RpcError as e:
+                _raise_rpc(e, "check_permission", resource_uid)
+            _check(resp, "check_permission", resource_uid)
+            return bool(resp.has_permission)
+        return self._cached(resource_uid, ("perm", perm), auth, fetch)
 
     def get_effective_permissions(self, resource_uid: str, user: str = None, tenant: str = None,
                                   roles: list = None, claims: list = None) -> list:
@@ -768,6 +1420,8 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "grant_permission", resource_uid)
         _check(resp, "grant_permission", resource_uid)
+        # ACLs are inherited, so the change can affect any cached descendant.
+        self.clear_cache()
         return True
 
     def revoke_permission(self, resource_uid: str, principal: str, permission, effect="allow",
@@ -783,6 +1437,33 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "revoke_permission", resource_uid)
         _check(resp, "revoke_permission", resource_uid)
+        self.clear_cache()
+        return True
+
+    def grant_permissions(self, grants: List[tuple], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Apply several grants at once. Each grant is ``(resource_uid,
+        principal, permission)`` or ``(resource_uid, principal, permission,
+        effect)``, as for :meth:`grant_permission`. The calls are pipelined,
+        so K grants cost about one round trip. Returns True; the first
+        failure is raised once all calls have finished."""
+        return self._change_permissions("GrantPermission", fileservice_pb2.GrantPermissionRequest,
+                                        "grant_permission", grants, user, tenant, roles, claims)
+
+    def revoke_permissions(self, grants: List[tuple], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
+        """Revoke several grants at once (mirror of :meth:`grant_permissions`)."""
+        return self._change_permissions("RevokePermission", fileservice_pb2.RevokePermissionRequest,
+                                        "revoke_permission", grants, user, tenant, roles, claims)
+
+    def _change_permissions(self, rpc, request_cls, operation, grants, user, tenant, roles, claims):
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        grants = [tuple(g) for g in grants]
+        try:
+            self._pipeline(rpc, operation, {
+                i: request_cls(resource_uid=g[0], principal=g[1], permission=_coerce_permission(g[2]),
+                               effect=_coerce_effect(g[3] if len(g) > 3 else "allow"), auth=auth)
+                for i, g in enumerate(grants)}, uid=lambda i: grants[i][0])
+        finally:
+            self.clear_cache()      # some may have applied even if one failed
         return True
 
     # ------------------------------------------------------------------ #
@@ -806,6 +1487,7 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "delete_role")
         _check(resp, "delete_role")
+        self.clear_cache()      # role membership feeds every permission check
         return True
 
     def assign_user_to_role(self, target_user: str, role: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
@@ -817,6 +1499,7 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "assign_user_to_role")
         _check(resp, "assign_user_to_role")
+        self.clear_cache()      # role membership feeds every permission check
         return True
 
     def remove_user_from_role(self, target_user: str, role: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> bool:
@@ -828,6 +1511,7 @@ class ManagedFiles:
         except grpc.RpcError as e:
             _raise_rpc(e, "remove_user_from_role")
         _check(resp, "remove_user_from_role")
+        self.clear_cache()      # role membership feeds every permission check
         return True
 
     def get_roles_for_user(self, target_user: str, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> list:
@@ -890,3 +1574,104 @@ class ManagedFiles:
             _raise_rpc(e, "trigger_sync")
         _check(resp, "trigger_sync")
         return True
+
+    # ------------------------------------------------------------------ #
+    # Batching
+    # ------------------------------------------------------------------ #
+    def batch(self, ops: Dict[str, tuple]) -> dict:
+        """Run several independent client calls concurrently; return their results.
+
+        ``ops`` maps a result key to ``(method_name, args)`` or
+        ``(method_name, args, kwargs)``, naming a read-only ``ManagedFiles``
+        method (listings, reads, ``stat``-style probes, metadata, permission
+        and role queries); anything else raises :class:`InvalidRequestError`.
+        The calls are issued together over the channel, so N read-only
+        probes cost roughly one round trip instead of N. Returns
+        ``{key: result}``. The calls are independent — do not batch operations
+        that depend on each other's effects. If any call raises, the first
+        failure (in ``ops`` order) is raised once all calls have finished.
+
+        Example::
+
+            mf.batch({"name": ("file_name", (uid,)),
+                      "revs": ("revisions", (uid,)),
+                      "can_read": ("check_permission", (uid, "r"))})
+        """
+        calls = {}
+        for key, op in ops.items():
+            if not isinstance(op, tuple) or not 2 <= len(op) <= 3:
+                raise InvalidRequestError(
+                    f"batch entry {key!r} must be (method_name, args[, kwargs]), not {op!r}",
+                    operation="batch")
+            name, args = op[0], op[1]
+            kwargs = op[2] if len(op) > 2 else {}
+            if name not in _BATCH_OPERATIONS:
+                raise InvalidRequestError(f"unknown batch operation {name!r}", operation="batch")
+            calls[key] = (getattr(self, name), tuple(args), dict(kwargs))
+        if not calls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(calls), _BATCH_MAX_WORKERS)) as pool:
+            futures = {key: pool.submit(fn, *args, **kwargs)
+                       for key, (fn, args, kwargs) in calls.items()}
+        for fut in futures.values():
+            if fut.exception() is not None:
+                raise fut.exception()
+        return {key: fut.result() for key, fut in futures.items()}
+
+    def _pipeline(self, rpc, operation, requests, default_cls=OperationError, uid=None) -> dict:
+        """Issue the unary ``rpc`` for every ``{key: request}`` at once as gRPC
+        futures (pipelined on the channel, no threads) and return
+        ``{key: checked response}``. Errors name ``uid`` (a UID, or a function
+        of the key) if given, else the key. The first failure, in ``requests``
+        order, is raised once all calls have finished."""
+        pending = {key: getattr(self.stub, rpc).future(req) for key, req in requests.items()}
+        results, failure = {}, None
+        for key, fut in pending.items():
+            err_uid = key if uid is None else uid(key) if callable(uid) else uid
+            try:
+                try:
+                    resp = fut.result()
+                except grpc.RpcError as e:
+                    _raise_rpc(e, operation, err_uid)
+                results[key] = _check(resp, operation, err_uid, default_cls=default_cls)
+            except FileEngineError as e:
+                failure = failure or e
+        if failure is not None:
+            raise failure
+        return results
+
+    def dir_batch(self, uids: List[str], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> Dict[str, List[DirectoryEntry]]:
+        """List several directories concurrently; returns ``{uid: [DirectoryEntry]}``.
+        Raises the first failure (see :meth:`batch`)."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resps = self._pipeline("ListDirectory", "dir", {
+            uid: fileservice_pb2.ListDirectoryRequest(uid=uid, auth=auth) for uid in uids},
+            default_cls=NotFoundError)
+        return {uid: [_to_directory_entry(e) for e in resp.entries] for uid, resp in resps.items()}
+
+    def exists_batch(self, uids: List[str], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> Dict[str, bool]:
+        """Check several entities concurrently; returns ``{uid: exists}``."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resps = self._pipeline("Exists", "entity_exists", {
+            uid: fileservice_pb2.ExistsRequest(uid=uid, auth=auth) for uid in uids})
+        return {uid: bool(resp.exists) for uid, resp in resps.items()}
+
+    def check_permission_batch(self, resource_uids: List[str], required_permission, user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> Dict[str, bool]:
+        """Check one permission on several resources concurrently; returns
+        ``{resource_uid: has_permission}``. Raises the first failure (see
+        :meth:`batch`)."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        perm = _coerce_permission(required_permission)
+        resps = self._pipeline("CheckPermission", "check_permission", {
+            uid: fileservice_pb2.CheckPermissionRequest(resource_uid=uid, required_permission=perm, auth=auth)
+            for uid in resource_uids})
+        return {uid: bool(resp.has_permission) for uid, resp in resps.items()}
+
+    def metadata_batch(self, uids: List[str], user: str = None, tenant: str = None, roles: list = None, claims: list = None) -> Dict[str, dict]:
+        """Fetch all metadata of several entities concurrently; returns
+        ``{uid: {key: value}}``. Raises the first failure (see :meth:`batch`)."""
+        auth = self._create_auth_context(user, tenant, roles, claims)
+        resps = self._pipeline("GetAllMetadata", "get_metadata_values", {
+            uid: fileservice_pb2.GetAllMetadataRequest(uid=uid, auth=auth) for uid in uids},
+            default_cls=NotFoundError)
+        return {uid: dict(resp.metadata) for uid, resp in resps.items()}
@@ -43,8 +43,9 @@ class TestInit(unittest.TestCase):
 
     def test_all_list(self):
         from fileengine import __all__
-        expected = ["ManagedFiles", "FileType", "FileInfo", "DirectoryEntry",
-                    "Revision", "StorageUsage", "ROOT_UID", "ZERO_UID",
+        expected = ["ManagedFiles", "AsyncManagedFiles", "FileType", "FileInfo", "DirectoryEntry",
+                    "Revision", "StorageUsage", "ROOT_UID", "ZERO_UID", "get_shared_channel",
+                    "close_shared_channels", "ChannelPool", "Permission",
                     "FileEngineError", "FileSystemError", "ServerUnreachableError",
                     "ServiceUnavailableError", "WriteUnavailableError",
                     "AuthenticationError", "PermissionDeniedError", "NotFoundError",
@@ -13,6 +13,7 @@ Skips itself automatically if no server is reachable.
 import os
 import time
 import unittest
+import uuid
 
 from fileengine import ManagedFiles, FileType, ZERO_UID, FileEngineError, NotFoundError
 
@@ -36,7 +37,8 @@ class TestFullIntegration(unittest.TestCase):
         # Admin identity is the system_admin *role* (username is arbitrary).
         cls.admin = ManagedFiles(user_name="admin_user", user_roles=["system_admin"],
                                  server_address=SERVER, tenant="default")
-        cls.suffix = f"{int(time.time())}_{os.getpid()}"
+        # Unique per run even when several containers (same pid) share a server.
+        cls.suffix = f"{int(time.time())}_{uuid.uuid4().hex[:8]}"
         cls.ws = cls.admin.mkdir("", f"pyit_{cls.suffix}")
         assert cls.ws, "could not create workspace (is system_admin honored?)"
 
@@ -85,11 +87,21 @@ class TestFullIntegration(unittest.TestCase):
         self.assertTrue(self.admin.stat(d).is_dir)
         self.assertFalse(self.admin.stat(f).is_dir)
         self.assertEqual(self.admin.get_parent(f), self.ws)
+        # Lazy listing: stop converting entries once the wanted one is found.
+        found = next(e for e in self.admin.iter_dir(self.ws) if e.name == "sub")
+        self.assertEqual(found.uid, d)
+        self.assertTrue(found.is_container)
 
     def test_11_get_roundtrip(self):
         f = self._mkfile("rt.txt", b"roundtrip-content")
         self.assertEqual(self.admin.get(f).getvalue(), b"roundtrip-content")
 
+    def test_11b_streamed_put_roundtrip(self):
+        # Larger than one upload chunk, so put() takes the StreamFileUpload path.
+        payload = bytes(range(256)) * 4096
+        f = self._mkfile("big.bin", payload)
+        self.assertEqual(self.admin.get_bytes(f), payload)
+
     def test_12_rename_move_copy(self):
         f = self._mkfile("orig.txt", b"x")
         self.assertTrue(self.admin.rename(f, "renamed.txt"))
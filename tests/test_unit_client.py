@@ -0,0 +1,915 @@
+"""Offline unit tests — client transport behaviour (channel sharing and
+ownership, batching). These do not require a running server: channels connect
+lazily, and RPC behaviour is exercised against an in-process fake stub."""
+import array
+import asyncio
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent import futures
+
+import grpc
+
+from fileengine import ManagedFiles, AsyncManagedFiles, ChannelPool, get_shared_channel, close_shared_channels
+from fileengine import InvalidRequestError, NotFoundError, Permission, ServerUnreachableError
+from fileengine import PermissionDeniedError, ServiceUnavailableError
+from fileengine import channel, fileservice_pb2 as pb, fileservice_pb2_grpc as pb_grpc
+from fileengine.cache import TTLCache
+
+
+class FakeStub:
+    """Stands in for ``FileServiceStub``: each RPC attribute returns the canned
+    response registered for it and records the request it was called with."""
+
+    def __init__(self, **responses):
+        self.responses = responses
+        self.calls = []
+        self.call_kwargs = {}   # rpc -> keyword arguments of its latest call
+
+    def __getattr__(self, rpc):
+        if rpc not in self.responses:
+            raise AttributeError(rpc)
+
+        def call(request, **kwargs):
+            self.calls.append((rpc, request))
+            self.call_kwargs[rpc] = kwargs
+            resp = self.responses[rpc]
+            return resp(request) if callable(resp) else resp
+        call.future = lambda request, **kwargs: _Done(call(request, **kwargs))
+        return call
+
+
+class _Done:
+    """An already-completed stand-in for a gRPC call future."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def result(self, timeout=None):
+        return self.value
+
+
+class FakeAioStub(FakeStub):
+    """Async flavour of :class:`FakeStub`: unary RPCs return awaitables and
+    ``StreamFileDownload`` returns an async iterator."""
+
+    def __getattr__(self, rpc):
+        call = super().__getattr__(rpc)
+        if rpc == "StreamFileDownload":
+            async def stream(request, **kwargs):
+                for resp in call(request, **kwargs):
+                    yield resp
+            return stream
+
+        async def unary(request, **kwargs):
+            return call(request, **kwargs)
+        return unary
+
+
+class _RpcFailure(grpc.RpcError):
+    """A transport-level failure as raised by a gRPC stub."""
+
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return "injected"
+
+
+def _failing(code):
+    def rpc(request):
+        raise _RpcFailure(code)
+    return rpc
+
+
+def _client(stub, **kwargs):
+    mf = ManagedFiles(user_name="alice", server_address="localhost:50999", **kwargs)
+    mf._stub = stub
+    return mf
+
+
+class TestChannelSharing(unittest.TestCase):
+    def tearDown(self):
+        # Leave no shared channel (or idle-close timer) behind for other tests.
+        close_shared_channels()
+
+    def _open(self, **kwargs):
+        mf = ManagedFiles(**kwargs)
+        self.addCleanup(mf.close)
+        return mf
+
+    def test_clients_share_channel_per_address(self):
+        a = self._open(server_address="localhost:50999")
+        b = self._open(server_address="localhost:50999")
+        self.assertIs(a.channel, b.channel)
+        self.assertIs(a.channel, get_shared_channel("localhost:50999"))
+        self.assertIsNot(a.channel, self._open(server_address="localhost:50998").channel)
+
+    def test_close_leaves_shared_channel_open(self):
+        a = self._open(server_address="localhost:50999")
+        a.close()
+        a.close()  # idempotent
+        self.assertFalse(a._owns_channel)
+        self.assertIs(self._open(server_address="localhost:50999").channel, a.channel)
+
+    def test_idle_shared_channel_is_closed_after_last_release(self):
+        addr = "localhost:50997"
+        a = self._open(server_address=addr)
+        b = self._open(server_address=addr)
+        self.assertIs(a.channel, b.channel)
+        a.close()
+        a.close()  # releases its reference only once
+        entry = channel._shared[addr]
+        self.assertEqual(entry.refs, 1)
+        idle = channel.SHARED_CHANNEL_IDLE_SECONDS
+        channel.SHARED_CHANNEL_IDLE_SECONDS = 0
+        try:
+            b.close()
+        finally:
+            channel.SHARED_CHANNEL_IDLE_SECONDS = idle
+        entry.timer.join()
+        self.assertNotIn(addr, channel._shared)
+        self.assertIsNot(self._open(server_address=addr).channel, a.channel)
+
+    def test_close_shared_channels(self):
+        addr = "localhost:50996"
+        first = self._open(server_address=addr).channel
+        close_shared_channels()
+        self.assertNotIn(addr, channel._shared)
+        self.assertIsNot(self._open(server_address=addr).channel, first)
+
+    def test_stale_client_does_not_release_replacement_channel(self):
+        addr = "localhost:50995"
+        a = self._open(server_address=addr)
+        close_shared_channels()
+        b = self._open(server_address=addr)
+        a.close()
+        entry = channel._shared[addr]
+        self.assertIs(entry.channel, b.channel)
+        self.assertEqual(entry.refs, 1)
+        self.assertIsNone(entry.timer)
+
+    def test_wait_ready_times_out_without_server(self):
+        mf = self._open(server_address="localhost:50999")
+        with self.assertRaises(ServerUnreachableError) as cm:
+            mf.wait_ready(timeout=0.05)
+        self.assertTrue(cm.exception.transient)
+
+    def test_wait_ready_timeout_covers_whole_pool(self):
+        mf = self._open(server_address="localhost:50999", channel_pool_size=4)
+        start = time.monotonic()
+        with self.assertRaises(ServerUnreachableError):
+            mf.wait_ready(timeout=0.3)
+        self.assertLess(time.monotonic() - start, 0.9)   # not 4 x 0.3 s
+
+    def test_start_connecting_does_not_block(self):
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        try:
+            mf = self._open(server_address=f"localhost:{port}", shared_channel=False)
+            ready = threading.Event()
+            mf.channel.subscribe(lambda state: state == grpc.ChannelConnectivity.READY and ready.set())
+            mf.start_connecting()
+            self.assertTrue(ready.wait(5))     # connected without any RPC
+        finally:
+            server.stop(0)
+
+    def test_caller_supplied_channel_is_not_owned(self):
+        ch = grpc.insecure_channel("localhost:50999")
+        self.addCleanup(ch.close)
+        mf = self._open(channel=ch)
+        self.assertIs(mf.channel, ch)
+        mf.close()
+        self.assertFalse(mf._owns_channel)
+
+    def test_private_channel_is_owned(self):
+        mf = self._open(server_address="localhost:50999", shared_channel=False)
+        self.assertTrue(mf._owns_channel)
+        self.assertIsNot(mf.channel, get_shared_channel("localhost:50999"))
+
+
+class TestRpcErrors(unittest.TestCase):
+    def test_status_codes_map_to_typed_exceptions(self):
+        S = grpc.StatusCode
+        cases = [
+            ("MakeDirectory", lambda mf: mf.mkdir("p", "n"), S.UNAVAILABLE, ServerUnreachableError),
+            ("Exists", lambda mf: mf.entity_exists("u"), S.PERMISSION_DENIED, PermissionDeniedError),
+            ("Stat", lambda mf: mf.stat("u"), S.NOT_FOUND, NotFoundError),
+            ("ListVersions", lambda mf: mf.revisions("u"), S.INTERNAL, ServiceUnavailableError),
+            ("RemoveFile", lambda mf: mf.remove("u", is_dir=False), S.INVALID_ARGUMENT, InvalidRequestError),
+        ]
+        for rpc, call, code, exc in cases:
+            with self.subTest(rpc=rpc):
+                mf = _client(FakeStub(**{rpc: _failing(code)}))
+                with self.assertRaises(exc) as cm:
+                    call(mf)
+                self.assertEqual(cm.exception.uid, "u" if rpc != "MakeDirectory" else "p")
+
+
+class TestMutations(unittest.TestCase):
+    """Success and server-reported failure for the simple mutating calls."""
+
+    # (rpc, success response, call, expected result, expected request given auth)
+    CASES = [
+        ("Move", pb.MoveResponse(success=True), lambda mf: mf.move("u", "d"), True,
+         lambda auth: pb.MoveRequest(source_uid="u", destination_parent_uid="d", auth=auth)),
+        ("Copy", pb.CopyResponse(success=True), lambda mf: mf.copy("u", "d"), True,
+         lambda auth: pb.CopyRequest(source_uid="u", destination_parent_uid="d", auth=auth)),
+        ("GrantPermission", pb.GrantPermissionResponse(success=True),
+         lambda mf: mf.grant_permission("u", "bob", "r"), True,
+         lambda auth: pb.GrantPermissionRequest(resource_uid="u", principal="bob",
+                                                permission=pb.READ, effect=pb.ALLOW, auth=auth)),
+        ("RevokePermission", pb.RevokePermissionResponse(success=True),
+         lambda mf: mf.revoke_permission("u", "bob", "r"), True,
+         lambda auth: pb.RevokePermissionRequest(resource_uid="u", principal="bob",
+                                                 permission=pb.READ, effect=pb.ALLOW, auth=auth)),
+        ("RestoreToVersion", pb.RestoreToVersionResponse(success=True, restored_version="v1"),
+         lambda mf: mf.restore_to_version("u", "v1"), "v1",
+         lambda auth: pb.RestoreToVersionRequest(uid="u", version_timestamp="v1", auth=auth)),
+    ]
+
+    def test_success_and_failure(self):
+        for rpc, ok, call, expected, request in self.CASES:
+            with self.subTest(rpc=rpc, outcome="success"):
+                stub = FakeStub(**{rpc: ok})
+                mf = _client(stub)
+                self.assertEqual(call(mf), expected)
+                # Whole-message comparison covers every field, including auth.
+                self.assertEqual(stub.calls, [(rpc, request(mf._create_auth_context()))])
+            with self.subTest(rpc=rpc, outcome="failure"):
+                stub = FakeStub(**{rpc: type(ok)(success=False, error="permission denied")})
+                with self.assertRaises(PermissionDeniedError) as cm:
+                    call(_client(stub))
+                self.assertEqual(cm.exception.uid, "u")
+
+    def test_remove_when_stat_is_refused(self):
+        stub = FakeStub(Stat=pb.StatResponse(success=False, error="permission denied"),
+                        RemoveFile=pb.RemoveFileResponse(success=True))
+        self.assertTrue(_client(stub).remove("u"))
+        self.assertEqual([name for name, _ in stub.calls], ["Stat", "RemoveFile"])
+        stub = FakeStub(Stat=_failing(grpc.StatusCode.UNAVAILABLE))
+        with self.assertRaises(ServerUnreachableError):
+            _client(stub).remove("u")
+
+
+class TestBulkPermissions(unittest.TestCase):
+    def test_grants_pipelined_and_failures_name_the_resource(self):
+        stub = FakeStub(
+            GrantPermission=lambda req: pb.GrantPermissionResponse(
+                success=req.resource_uid != "locked", error="permission denied"),
+            RevokePermission=pb.RevokePermissionResponse(success=True),
+        )
+        mf = _client(stub)
+        grants = [(f"f{i}", "bob", "r") for i in range(10)] + [("f0", "role:eds", "w", "deny")]
+        self.assertTrue(mf.grant_permissions(grants))
+        reqs = [req for _, req in stub.calls]
+        self.assertEqual(len(reqs), 11)
+        self.assertEqual((reqs[-1].principal, reqs[-1].permission, reqs[-1].effect),
+                         ("role:eds", pb.WRITE, pb.DENY))
+        self.assertTrue(mf.revoke_permissions([("f1", "bob", "r")]))
+        with self.assertRaises(PermissionDeniedError) as cm:
+            mf.grant_permissions([("f1", "bob", "r"), ("locked", "bob", "r")])
+        self.assertEqual(cm.exception.uid, "locked")
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Runs against an in-process server, since the retry policy lives in the
+    channel rather than in client code."""
+
+    def test_only_read_only_rpcs_are_retried(self):
+        attempts = {"Stat": 0, "Touch": 0}
+
+        class Flaky(pb_grpc.FileServiceServicer):
+            def Stat(self, request, context):
+                attempts["Stat"] += 1
+                if attempts["Stat"] < 3:
+                    context.abort(grpc.StatusCode.UNAVAILABLE, "restarting")
+                return pb.StatResponse(success=True, info=pb.FileInfo(uid="f1", name="a.txt"))
+
+            def Touch(self, request, context):
+                attempts["Touch"] += 1
+                context.abort(grpc.StatusCode.UNAVAILABLE, "restarting")
+
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        pb_grpc.add_FileServiceServicer_to_server(Flaky(), server)
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        try:
+            mf = ManagedFiles(server_address=f"localhost:{port}", shared_channel=False)
+            self.assertEqual(mf.file_name("f1"), ["a.txt"])
+            with self.assertRaises(ServerUnreachableError):
+                mf.touch("d1", "new.txt")
+            mf.close()
+        finally:
+            server.stop(0)
+        self.assertEqual(attempts, {"Stat": 3, "Touch": 1})
+
+
+class TestUnixSocket(unittest.TestCase):
+    def test_client_over_unix_domain_socket(self):
+        class Echo(pb_grpc.FileServiceServicer):
+            def Stat(self, request, context):
+                return pb.StatResponse(success=True, info=pb.FileInfo(uid=request.uid, name="a.txt"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            address = f"unix:{os.path.join(tmp, 'fileengine.sock')}"
+            server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+            pb_grpc.add_FileServiceServicer_to_server(Echo(), server)
+            server.add_insecure_port(address)
+            server.start()
+            try:
+                with ManagedFiles(server_address=address, shared_channel=False) as mf:
+                    self.assertEqual(mf.stat("f1").name, "a.txt")
+            finally:
+                server.stop(0)
+
+
+class TestChannelPool(unittest.TestCase):
+    def test_round_robin(self):
+        pool = ChannelPool("localhost:50999", size=3)
+        self.assertEqual(len(pool), 3)
+        self.assertEqual([pool.next_index() for _ in range(7)], [0, 1, 2, 0, 1, 2, 0])
+        pool.close()
+
+    def test_client_cycles_pool_stubs(self):
+        pool = ChannelPool("localhost:50999", size=2)
+        mf = ManagedFiles(channel_pool=pool)
+        self.assertEqual([mf.stub for _ in range(4)], pool.stubs * 2)
+        mf.close()
+        pool.close()
+
+    def test_client_owned_pool(self):
+        mf = ManagedFiles(server_address="localhost:50999", channel_pool_size=3)
+        pool = mf._pool
+        self.assertEqual(len(pool), 3)
+        self.assertEqual([mf.stub for _ in range(3)], pool.stubs)
+        mf.close()
+        with self.assertRaises(ValueError):   # closed with the client
+            pool.channels[0].unary_unary("/x")(b"")
+
+    def test_rejects_bad_configuration(self):
+        with self.assertRaises(ValueError):
+            ChannelPool("localhost:50999", size=0)
+        pool = ChannelPool("localhost:50999", size=1)
+        with self.assertRaises(ValueError):
+            ManagedFiles(channel=pool.channels[0], channel_pool=pool)
+        with self.assertRaises(ValueError):
+            ManagedFiles(channel_pool=pool, channel_pool_size=2)
+        pool.close()
+
+
+class TestBatch(unittest.TestCase):
+    def test_batch_returns_results_by_key(self):
+        info = pb.FileInfo(uid="f1", name="a.txt", modified_at=1_700_000_000)
+        stub = FakeStub(
+            Stat=pb.StatResponse(success=True, info=info),
+            ListVersions=pb.ListVersionsResponse(success=True, versions=["v2", "v1"]),
+            CheckPermission=pb.CheckPermissionResponse(success=True, has_permission=True),
+        )
+        mf = _client(stub)
+        out = mf.batch({
+            "name": ("file_name", ("f1",)),
+            "revs": ("revisions", ("f1",)),
+            "can_read": ("check_permission", ("f1", "r"), {"user": "bob"}),
+        })
+        self.assertEqual(out["name"], ["a.txt"])
+        self.assertEqual([r.version for r in out["revs"]], ["v2", "v1"])
+        self.assertTrue(out["can_read"])
+        checks = [req for rpc, req in stub.calls if rpc == "CheckPermission"]
+        self.assertEqual(checks[0].auth.user, "bob")
+        self.assertEqual(mf.batch({}), {})
+
+    def test_batch_raises_first_failure(self):
+        stub = FakeStub(
+            Stat=pb.StatResponse(success=True, info=pb.FileInfo(uid="f1", name="a")),
+            ListVersions=pb.ListVersionsResponse(success=False, error="file not found"),
+        )
+        mf = _client(stub)
+        with self.assertRaises(NotFoundError):
+            mf.batch({"name": ("file_name", ("f1",)), "revs": ("revisions", ("f1",))})
+
+    def test_multi_entity_helpers(self):
+        stub = FakeStub(
+            ListDirectory=lambda req: pb.ListDirectoryResponse(
+                success=True, entries=[pb.DirectoryEntry(uid=req.uid + "/x", name="x")]),
+            Exists=lambda req: pb.ExistsResponse(success=True, exists=req.uid != "gone"),
+            GetAllMetadata=lambda req: pb.GetAllMetadataResponse(
+                success=True, metadata={"owner": req.uid}),
+        )
+        mf = _client(stub)
+        listing = mf.dir_batch(["d1", "d2"], user="bob")
+        self.assertEqual({k: [e.uid for e in v] for k, v in listing.items()},
+                         {"d1": ["d1/x"], "d2": ["d2/x"]})
+        self.assertEqual(mf.exists_batch(["a", "gone", "a"], user="bob"), {"a": True, "gone": False})
+        self.assertEqual(mf.metadata_batch(["a", "b"], user="bob"),
+                         {"a": {"owner": "a"}, "b": {"owner": "b"}})
+        self.assertTrue(all(req.auth.user == "bob" for _, req in stub.calls))
+
+    def test_check_permission_batch(self):
+        stub = FakeStub(CheckPermission=lambda req: pb.CheckPermissionResponse(
+            success=True, has_permission=req.resource_uid != "secret"))
+        out = _client(stub).check_permission_batch(["a", "secret"], "r", user="bob")
+        self.assertEqual(out, {"a": True, "secret": False})
+        reqs = [req for rpc, req in stub.calls]
+        self.assertTrue(all(req.required_permission == pb.READ and req.auth.user == "bob"
+                            for req in reqs))
+
+    def test_pipelined_helpers_raise_after_all_calls(self):
+        stub = FakeStub(ListDirectory=lambda req: pb.ListDirectoryResponse(
+            success=req.uid != "missing", error="directory not found"))
+        with self.assertRaises(NotFoundError) as cm:
+            _client(stub).dir_batch(["d1", "missing", "d2"])
+        self.assertEqual(cm.exception.uid, "missing")
+        self.assertEqual(len(stub.calls), 3)
+
+    def test_metadata_key_batches(self):
+        stub = FakeStub(
+            GetAllMetadataForVersion=pb.GetAllMetadataForVersionResponse(
+                success=True, metadata={"a": "1", "b": "2", "c": "3"}),
+            DeleteMetadata=lambda req: pb.DeleteMetadataResponse(
+                success=req.key != "gone", error="key not found"),
+        )
+        mf = _client(stub)
+        self.assertEqual(mf.get_metadata_batch("f1", "current", ["a", "c", "zz"]),
+                         {"a": "1", "c": "3"})
+        self.assertEqual(len(stub.calls), 1)
+        self.assertTrue(mf.delete_metadata_batch("f1", ["a", "b"]))
+        with self.assertRaises(NotFoundError) as cm:
+            mf.delete_metadata_batch("f1", ["gone", "c"])
+        self.assertEqual(cm.exception.uid, "f1")
+        deletes = [req.key for rpc, req in stub.calls if rpc == "DeleteMetadata"]
+        self.assertEqual(deletes, ["a", "b", "gone", "c"])
+
+    def test_metadata_listing_without_copy(self):
+        stub = FakeStub(GetAllMetadata=pb.GetAllMetadataResponse(success=True, metadata={"k": "v"}))
+        mf = _client(stub)
+        self.assertIs(type(mf.get_metadata_values("f1")), dict)
+        view = mf.get_metadata_values("f1", materialize=False)
+        self.assertNotIsInstance(view, dict)
+        self.assertEqual(dict(view), {"k": "v"})
+
+    def test_batch_rejects_unknown_operations(self):
+        mf = _client(FakeStub())
+        for name in ("_check", "batch", "no_such_method", "user", "remove", "put",
+                     "close", "set_user_information", "clear_cache"):
+            with self.assertRaises(InvalidRequestError):
+                mf.batch({"x": (name, ())})
+        for op in (("stat",), "stat", ["stat", ("f1",)], ("stat", ("f1",), {}, None)):
+            with self.assertRaises(InvalidRequestError):
+                mf.batch({"x": op})
+
+
+class TestPut(unittest.TestCase):
+    def test_small_payload_is_unary(self):
+        stub = FakeStub(PutFile=pb.PutFileResponse(success=True))
+        _client(stub).put("f1", "hello")
+        self.assertEqual([(rpc, req.data) for rpc, req in stub.calls], [("PutFile", b"hello")])
+
+    def test_large_payload_is_streamed_in_chunks(self):
+        received = []
+
+        def upload(chunks):
+            received.extend(chunks)
+            return pb.PutFileResponse(success=True)
+        stub = FakeStub(StreamFileUpload=upload)
+        payload = bytes(range(256)) * 2049          # just over two 256 KiB chunks
+        _client(stub).put("f1", payload)
+        self.assertEqual([c.chunk_index for c in received], [0, 1, 2])
+        self.assertTrue(all(c.total_chunks == 3 and c.uid == "f1" for c in received))
+        self.assertEqual(b"".join(c.data for c in received), payload)
+        self.assertEqual(received[0].auth.user, "alice")
+
+    def test_bytes_like_payloads(self):
+        received = []
+
+        def upload(chunks):
+            received.extend(chunks)
+            return pb.PutFileResponse(success=True)
+        stub = FakeStub(PutFile=pb.PutFileResponse(success=True), StreamFileUpload=upload)
+        mf = _client(stub)
+        mf.put("f1", bytearray(b"abc"))
+        mf.put("f1", memoryview(b"xabcx")[1:4])
+        self.assertEqual([req.data for _, req in stub.calls], [b"abc", b"abc"])
+        big = array.array("i", range(100_000))      # 400 KB, 4-byte items
+        mf.put("f1", big)
+        self.assertEqual(b"".join(c.data for c in received), big.tobytes())
+
+    def test_seekable_file_is_streamed(self):
+        received = []
+
+        def upload(chunks):
+            received.extend(chunks)
+            return pb.PutFileResponse(success=True)
+        stub = FakeStub(StreamFileUpload=upload, PutFile=pb.PutFileResponse(success=True))
+        payload = bytes(range(256)) * 2049
+        f = io.BytesIO(b"skip" + payload)
+        f.seek(4)
+        _client(stub).put("f1", f)
+        self.assertEqual([c.total_chunks for c in received], [3, 3, 3])
+        self.assertEqual(b"".join(c.data for c in received), payload)
+        _client(stub).put("f1", io.BytesIO(b"small"))
+        self.assertEqual(stub.calls[-1][1].data, b"small")
+
+    def test_short_reads_fill_chunks_and_early_eof_raises(self):
+        class Trickle(io.BytesIO):
+            """Returns at most 1000 bytes per read, and nothing past ``eof``."""
+            eof = None
+
+            def read(self, n=-1):
+                if self.eof is not None and self.tell() >= self.eof:
+                    return b""
+                return super().read(min(n, 1000))
+
+        def upload(chunks):
+            try:
+                received.extend(chunks)
+            except Exception:           # as gRPC does when the request iterator raises
+                raise _RpcFailure(grpc.StatusCode.UNKNOWN)
+            return pb.PutFileResponse(success=True)
+        stub = FakeStub(StreamFileUpload=upload)
+        payload = bytes(range(256)) * 2049
+        received = []
+        _client(stub).put("f1", Trickle(payload))
+        self.assertEqual([len(c.data) for c in received], [256 * 1024, 256 * 1024, len(payload) - 512 * 1024])
+        self.assertEqual(b"".join(c.data for c in received), payload)
+        received = []
+        shrunk = Trickle(payload)
+        shrunk.eof = 300 * 1024
+        with self.assertRaises(InvalidRequestError) as cm:
+            _client(stub).put("f1", shrunk)
+        self.assertEqual(cm.exception.operation, "put")
+        self.assertEqual(len(received), 1)
+
+    def test_compression_skips_small_payloads(self):
+        stub = FakeStub(PutFile=pb.PutFileResponse(success=True))
+        mf = _client(stub, compression="gzip")
+        mf.put("f1", b"x" * 4096)
+        self.assertEqual(stub.call_kwargs["PutFile"], {"compression": grpc.Compression.Gzip})
+        mf.put("f1", b"tiny")
+        self.assertEqual(stub.call_kwargs["PutFile"], {"compression": None})
+        _client(stub).put("f1", b"x" * 4096)
+        self.assertEqual(stub.call_kwargs["PutFile"], {"compression": None})
+        with self.assertRaises(ValueError):
+            _client(stub, compression="brotli")
+
+    def test_compression_for_large_metadata_values(self):
+        stub = FakeStub(SetMetadata=pb.SetMetadataResponse(success=True))
+        mf = _client(stub, compression="deflate")
+        mf.set_metadata_value("f1", "notes", "n" * 2048)
+        self.assertEqual(stub.call_kwargs["SetMetadata"], {"compression": grpc.Compression.Deflate})
+        mf.set_metadata_value("f1", "owner", "alice")
+        self.assertEqual(stub.call_kwargs["SetMetadata"], {"compression": None})
+        mf.set_metadata_value("f1", "notes", "\u00e9" * 600)    # 600 chars, 1200 bytes
+        self.assertEqual(stub.call_kwargs["SetMetadata"], {"compression": grpc.Compression.Deflate})
+
+
+class TestGet(unittest.TestCase):
+    def _stub(self):
+        return FakeStub(
+            StreamFileDownload=lambda req: iter([pb.GetFileResponse(success=True, data=b"ab"),
+                                                 pb.GetFileResponse(success=True, data=b"cd")]),
+            ListVersions=pb.ListVersionsResponse(success=True, versions=["v2", "v1"]),
+            GetVersion=lambda req: pb.GetVersionResponse(
+                success=True, data=req.version_timestamp.encode()),
+        )
+
+    def test_get_variants_agree(self):
+        mf = _client(self._stub())
+        self.assertEqual(mf.get("f1").getvalue(), b"abcd")
+        self.assertEqual(mf.get_bytes("f1"), b"abcd")
+        out = bytearray(b"stale contents")
+        self.assertEqual(mf.get_into("f1", out), 4)
+        self.assertEqual(out, b"abcd")
+        self.assertEqual(list(mf.iter_content("f1")), [b"ab", b"cd"])
+        out = bytearray(b"ab")
+        self.assertEqual(mf.get_into("f1", out), 4)
+        self.assertEqual(out, b"abcd")
+
+    def test_get_back_versions(self):
+        mf = _client(self._stub())
+        self.assertEqual(mf.get_bytes("f1", back=1), b"v1")
+        with self.assertRaises(NotFoundError):
+            mf.get("f1", back=2)
+
+    def test_get_version_skips_listing(self):
+        stub = self._stub()
+        self.assertEqual(_client(stub).get_version("f1", "v1"), b"v1")
+        self.assertEqual([rpc for rpc, _ in stub.calls], ["GetVersion"])
+
+    def test_get_versions_pipelined(self):
+        stub = self._stub()
+        mf = _client(stub)
+        self.assertEqual(mf.get_versions("f1", ["v1"]), {"v1": b"v1"})
+        self.assertEqual(mf.get_versions("f1"), {"v2": b"v2", "v1": b"v1"})
+        self.assertEqual([rpc for rpc, _ in stub.calls],
+                         ["GetVersion", "ListVersions", "GetVersion", "GetVersion"])
+
+    def test_error_frame_raises(self):
+        stub = FakeStub(StreamFileDownload=lambda req: iter(
+            [pb.GetFileResponse(success=False, error="file not found")]))
+        with self.assertRaises(NotFoundError):
+            _client(stub).get_bytes("f1")
+
+
+class TestDirFields(unittest.TestCase):
+    def test_fields_limit_materialized_entry(self):
+        entry = pb.DirectoryEntry(uid="f1", name="a", type=pb.DIRECTORY, size=5,
+                                  modified_at=1_700_000_000, owner="alice")
+        mf = _client(FakeStub(ListDirectory=pb.ListDirectoryResponse(success=True, entries=[entry])))
+        full, = mf.dir("d1")
+        self.assertEqual((full.size, full.owner), (5, "alice"))
+        self.assertIsNotNone(full.modified_at)
+        slim, = mf.dir("d1", fields={"type"})
+        self.assertTrue(slim.is_container)
+        self.assertEqual((slim.uid, slim.name, slim.size, slim.owner), ("f1", "a", 0, ""))
+        self.assertIsNone(slim.modified_at)
+        with self.assertRaises(InvalidRequestError):
+            mf.dir("d1", fields={"colour"})
+
+    def test_iter_dir_is_lazy_but_raises_eagerly(self):
+        entries = [pb.DirectoryEntry(uid=f"f{i}", name=str(i)) for i in range(3)]
+        mf = _client(FakeStub(ListDirectory=pb.ListDirectoryResponse(success=True, entries=entries)))
+        it = mf.iter_dir("d1")
+        self.assertNotIsInstance(it, list)
+        self.assertEqual([e.uid for e in it], ["f0", "f1", "f2"])
+        mf = _client(FakeStub(ListDirectory=pb.ListDirectoryResponse(success=False, error="no such dir")))
+        with self.assertRaises(NotFoundError):
+            mf.iter_dir("d1")
+
+    def test_dir_columns(self):
+        entries = [pb.DirectoryEntry(uid="f1", name="a", type=pb.DIRECTORY),
+                   pb.DirectoryEntry(uid="f2", name="b", size=7, modified_at=1_700_000_000)]
+        mf = _client(FakeStub(ListDirectory=pb.ListDirectoryResponse(success=True, entries=entries)))
+        self.assertEqual(mf.dir_columns("d1"), {
+            "uid": ["f1", "f2"], "name": ["a", "b"], "type": [pb.DIRECTORY, pb.REGULAR_FILE], "size": [0, 7]})
+        mtimes = mf.dir_columns("d1", columns=("modified_at",))["modified_at"]
+        self.assertIsNone(mtimes[0])
+        self.assertEqual(mtimes[1].year, 2023)
+        with self.assertRaises(InvalidRequestError):
+            mf.dir_columns("d1", columns=("colour",))
+
+
+class TestEnsurePath(unittest.TestCase):
+    def test_creates_optimistically(self):
+        def mkdir(req):
+            if req.name == "a":
+                return pb.MakeDirectoryResponse(success=False, error="a already exists")
+            return pb.MakeDirectoryResponse(success=True, uid=req.name + "-uid")
+        listing = pb.ListDirectoryResponse(success=True, entries=[
+            pb.DirectoryEntry(uid="d1", name="a", type=pb.DIRECTORY)])
+        stub = FakeStub(MakeDirectory=mkdir, ListDirectory=listing,
+                        Touch=pb.TouchResponse(success=True, uid="f-uid"))
+        mf = _client(stub)
+        self.assertEqual(mf.ensure_path("a/b/c/f.txt", create_file=True),
+                         ["d1", "b-uid", "c-uid", "f-uid"])
+        self.assertEqual([rpc for rpc, _ in stub.calls],
+                         ["MakeDirectory", "ListDirectory", "MakeDirectory", "MakeDirectory", "Touch"])
+
+    def test_wrong_type_rejected(self):
+        listing = pb.ListDirectoryResponse(success=True, entries=[
+            pb.DirectoryEntry(uid="f1", name="a", type=pb.REGULAR_FILE)])
+        mf = _client(FakeStub(ListDirectory=listing,
+                              MakeDirectory=pb.MakeDirectoryResponse(success=False, error="a already exists")))
+        with self.assertRaises(InvalidRequestError):
+            mf.ensure_path("a/b")
+        with self.assertRaises(InvalidRequestError):
+            mf.ensure_path("/")
+
+
+class TestCache(unittest.TestCase):
+    def _stub(self):
+        return FakeStub(
+            Stat=pb.StatResponse(success=True, info=pb.FileInfo(
+                uid="f1", name="a.txt", modified_at=1_700_000_000)),
+            ListVersions=pb.ListVersionsResponse(success=True, versions=["v1"]),
+            PutFile=pb.PutFileResponse(success=True),
+            RemoveFile=pb.RemoveFileResponse(success=True),
+            RemoveDirectory=pb.RemoveDirectoryResponse(success=True),
+        )
+
+    def _rpcs(self, stub):
+        return [rpc for rpc, _ in stub.calls]
+
+    def test_remove_reuses_cached_stat_or_hint(self):
+        stub = self._stub()
+        mf = _client(stub, cache_ttl=60)
+        mf.file_name("f1")
+        mf.remove("f1")
+        mf.remove("d1", is_dir=True)
+        self.assertEqual(self._rpcs(stub), ["Stat", "RemoveFile", "RemoveDirectory"])
+
+    def test_disabled_by_default(self):
+        stub = self._stub()
+        mf = _client(stub)
+        mf.file_name("f1")
+        mf.file_name("f1")
+        self.assertEqual(self._rpcs(stub), ["Stat", "Stat"])
+
+    def test_stat_lookups_share_one_rpc(self):
+        stub = self._stub()
+        mf = _client(stub, cache_ttl=60)
+        self.assertEqual(mf.file_name("f1"), ["a.txt"])
+        self.assertIsNotNone(mf.get_file_mtime("f1"))
+        revs = mf.revisions("f1")
+        self.assertEqual(mf.revision_versions("f1"), [r.version for r in revs])
+        self.assertEqual(self._rpcs(stub), ["Stat", "ListVersions"])
+        # A different identity does not see alice's cached answers.
+        mf.file_name("f1", user="bob")
+        self.assertEqual(self._rpcs(stub).count("Stat"), 2)
+
+    def test_writes_invalidate(self):
+        stub = self._stub()
+        mf = _client(stub, cache_ttl=60)
+        mf.stat("f1").name = "mutated"          # callers get copies
+        self.assertEqual(mf.file_name("f1"), ["a.txt"])
+        mf.put("f1", b"x")
+        mf.file_name("f1")
+        self.assertEqual(self._rpcs(stub), ["Stat", "PutFile", "Stat"])
+        mf.clear_cache()
+        mf.file_name("f1")
+        self.assertEqual(self._rpcs(stub).count("Stat"), 3)
+
+    def test_exists_cached_until_removed(self):
+        stub = self._stub()
+        stub.responses["Exists"] = pb.ExistsResponse(success=True, exists=True)
+        mf = _client(stub, cache_ttl=60)
+        self.assertTrue(mf.entity_exists("f1"))
+        self.assertTrue(mf.entity_exists("f1"))
+        mf.remove("f1", is_dir=False)
+        mf.entity_exists("f1")
+        self.assertEqual(self._rpcs(stub), ["Exists", "RemoveFile", "Exists"])
+
+    def test_move_and_directory_remove_invalidate_related_entries(self):
+        stub = self._stub()
+        stub.responses["Stat"] = lambda req: pb.StatResponse(success=True, info=pb.FileInfo(
+            uid=req.uid, name=req.uid, parent_uid="p1" if req.uid == "f1" else ""))
+        stub.responses["Move"] = pb.MoveResponse(success=True)
+        mf = _client(stub, cache_ttl=60)
+        mf.stat("p1")
+        mf.stat("f1")
+        mf.move("f1", "d2")                     # old parent p1 found in the cache
+        mf.stat("p1")
+        self.assertEqual(self._rpcs(stub), ["Stat", "Stat", "Move", "Stat"])
+        mf.stat("f1")
+        mf.remove("p1", is_dir=True)            # f1 may have been underneath
+        mf.stat("f1")
+        self.assertEqual(self._rpcs(stub)[-3:], ["Stat", "RemoveDirectory", "Stat"])
+        mf.stat("p1")
+        mf.move("g1", "d2")                     # parent unknown: no Stat, cache cleared
+        mf.stat("p1")
+        self.assertEqual(self._rpcs(stub)[-3:], ["Stat", "Move", "Stat"])
+
+    def test_permission_checks_cached_until_acl_change(self):
+        stub = FakeStub(
+            CheckPermission=pb.CheckPermissionResponse(success=True, has_permission=False),
+            GrantPermission=pb.GrantPermissionResponse(success=True),
+        )
+        mf = _client(stub, cache_ttl=60)
+        self.assertFalse(mf.check_permission("f1", "r"))
+        self.assertFalse(mf.check_permission("f1", Permission.READ))
+        mf.check_permission("f1", "w")
+        self.assertEqual(self._rpcs(stub), ["CheckPermission", "CheckPermission"])
+        mf.grant_permission("parent", "alice", "r")
+        mf.check_permission("f1", "r")
+        self.assertEqual(self._rpcs(stub).count("CheckPermission"), 3)
+
+    def test_ttl_cache_expiry_and_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.put("a", "k", 1)
+        cache.put("b", "k", 2)
+        cache.get("a", "k")                     # "a" becomes most recent
+        cache.put("c", "k", 3)                  # evicts "b"
+        self.assertEqual((cache.get("a", "k"), cache.get("b", "k")), (1, None))
+        expired = TTLCache(ttl=0)
+        expired.put("a", "k", 1)
+        self.assertIsNone(expired.get("a", "k"))
+        self.assertEqual(len(expired), 0)
+
+
+class TestAsyncClient(unittest.TestCase):
+    def _run(self, stub, coro_fn):
+        async def go():
+            mf = AsyncManagedFiles(user_name="alice", server_address="localhost:50999")
+            mf.stub = stub
+            try:
+                return await coro_fn(mf)
+            finally:
+                await mf.close()
+        return asyncio.run(go())
+
+    def test_gathered_calls(self):
+        stub = FakeAioStub(
+            Stat=pb.StatResponse(success=True, info=pb.FileInfo(uid="f1", name="a.txt")),
+            ListVersions=pb.ListVersionsResponse(success=True, versions=["v1"]),
+            ListDirectory=pb.ListDirectoryResponse(
+                success=True, entries=[pb.DirectoryEntry(uid="f1", name="a.txt")]),
+        )
+        listing, revs, name = self._run(stub, lambda mf: asyncio.gather(
+            mf.dir("d1"), mf.revisions("f1"), mf.file_name("f1")))
+        self.assertEqual([e.name for e in listing], ["a.txt"])
+        self.assertEqual([r.version for r in revs], ["v1"])
+        self.assertEqual(name, ["a.txt"])
+        self.assertTrue(all(req.auth.user == "alice" for _, req in stub.calls))
+
+    def test_streamed_get_and_errors(self):
+        stub = FakeAioStub(
+            StreamFileDownload=lambda req: iter([pb.GetFileResponse(success=True, data=b"ab"),
+                                                 pb.GetFileResponse(success=True, data=b"c")]),
+            Stat=pb.StatResponse(success=False, error="no such entity"),
+        )
+        self.assertEqual(self._run(stub, lambda mf: mf.get_bytes("f1")), b"abc")
+        self.assertFalse(self._run(stub, lambda mf: mf.is_dir("f1")))
+        with self.assertRaises(NotFoundError):
+            self._run(stub, lambda mf: mf.stat("f1"))
+
+    def test_first_failure_cancels_pending_calls(self):
+        cancelled = []
+
+        class Acl:
+            async def CheckPermission(self, request, **kwargs):
+                if request.resource_uid == "bad":
+                    raise _RpcFailure(grpc.StatusCode.PERMISSION_DENIED)
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(request.resource_uid)
+                    raise
+
+        with self.assertRaises(PermissionDeniedError):
+            self._run(Acl(), lambda mf: mf.check_permission_batch(["f1", "bad", "f2"], "r"))
+        self.assertEqual(sorted(cancelled), ["f1", "f2"])
+
+    def test_remove_type_hint(self):
+        stub = FakeAioStub(Stat=pb.StatResponse(success=False, error="permission denied"),
+                           RemoveFile=pb.RemoveFileResponse(success=True),
+                           RemoveDirectory=pb.RemoveDirectoryResponse(success=True))
+        self.assertTrue(self._run(stub, lambda mf: mf.remove("f1")))
+        self.assertTrue(self._run(stub, lambda mf: mf.remove("d1", is_dir=True)))
+        self.assertEqual([rpc for rpc, _ in stub.calls], ["Stat", "RemoveFile", "RemoveDirectory"])
+
+    def test_put_file_object_streams_from_executor(self):
+        received = []
+
+        class Upload:
+            async def StreamFileUpload(self, chunks, **kwargs):
+                async for chunk in chunks:
+                    received.append(chunk)
+                return pb.PutFileResponse(success=True)
+
+        payload = bytes(range(256)) * 4096    # 1 MiB -> 4 chunks
+        self._run(Upload(), lambda mf: mf.put("f1", io.BytesIO(payload)))
+        self.assertEqual(b"".join(c.data for c in received), payload)
+        self.assertEqual([c.total_chunks for c in received], [4] * 4)
+        with self.assertRaises(NotImplementedError):
+            self._run(Upload(), lambda mf: mf.put("f1", b"x", return_open=True))
+
+    def test_put_file_ending_early_raises(self):
+        class Upload:
+            async def StreamFileUpload(self, chunks, **kwargs):
+                try:
+                    async for _ in chunks:
+                        pass
+                except Exception:       # grpc.aio cancels the call instead
+                    raise asyncio.CancelledError()
+                return pb.PutFileResponse(success=True)
+
+        class Truncated(io.BytesIO):
+            def read(self, n=-1):
+                return b"" if self.tell() >= 300 * 1024 else super().read(n)
+
+        with self.assertRaises(InvalidRequestError):
+            self._run(Upload(), lambda mf: mf.put("f1", Truncated(b"x" * (600 * 1024))))
+
+    def test_gather_many(self):
+        stub = FakeAioStub(Exists=lambda req: pb.ExistsResponse(success=True, exists=req.uid != "gone"))
+        self.assertEqual(self._run(stub, lambda mf: mf.gather_many("entity_exists", ["a", "gone", "b"], limit=2)),
+                         [True, False, True])
+        with self.assertRaises(InvalidRequestError):
+            self._run(stub, lambda mf: mf.gather_many("_call", ["a"]))
+
+    def test_check_permission_batch_overlaps_calls(self):
+        in_flight = peak = 0
+
+        class SlowAcl:
+            async def CheckPermission(self, request, **kwargs):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0)
+                in_flight -= 1
+                return pb.CheckPermissionResponse(success=True, has_permission=request.resource_uid != "f2")
+
+        result = self._run(SlowAcl(), lambda mf: mf.check_permission_batch(["f1", "f2", "f3"], "r"))
+        self.assertEqual(result, {"f1": True, "f2": False, "f3": True})
+        self.assertEqual(peak, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -82,6 +82,30 @@ class TestAuthContext(unittest.TestCase):
         self.assertEqual(auth.tenant, "o")
         mf.close()
 
+    def test_default_context_reused_until_identity_changes(self):
+        mf = ManagedFiles(user_name="alice")
+        auth = mf._create_auth_context()
+        self.assertIs(mf._create_auth_context(), auth)
+        self.assertIsNot(mf._create_auth_context(user="bob"), auth)
+        mf.set_user_information(roles=["users"])
+        self.assertEqual(list(mf._create_auth_context().roles), ["users"])
+        mf.tenant = "t2"
+        self.assertEqual(mf._create_auth_context().tenant, "t2")
+        mf.close()
+
+    def test_override_contexts_reused(self):
+        mf = ManagedFiles(user_name="alice")
+        auth = mf._create_auth_context(user="bob", claims=["read", {"dept": "eng"}])
+        self.assertIs(mf._create_auth_context(user="bob", claims=["read", {"dept": "eng"}]), auth)
+        self.assertIsNot(mf._create_auth_context(user="bob", claims=["read"]), auth)
+        self.assertEqual(dict(auth.claims), {"read": "read", "dept": "eng"})
+        mf.set_user_information(roles=["users"])
+        self.assertIsNot(mf._create_auth_context(user="bob", claims=["read", {"dept": "eng"}]), auth)
+        mf.roles.append("auditors")
+        mf.invalidate_auth_cache()
+        self.assertEqual(list(mf._create_auth_context().roles), ["users", "auditors"])
+        mf.close()
+
 
 if __name__ == '__main__':
     unittest.main()